@@ -0,0 +1,55 @@
+import os
+import pygame
+from source.view.font import load_font
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+FONT_PATH = os.path.join(ASSETS_DIR, "font", "Pixellari.ttf")
+CLICK_SOUND_PATH = os.path.join(ASSETS_DIR, "sounds", "click.mp3")
+
+FONT_SIZE = 27
+SMALL_FONT_SIZE = 20
+CLICK_VOLUME = 0.4
+
+# every file the game can't start without, by what kind of file it is for the error message
+REQUIRED_FILES = {
+    "sound": CLICK_SOUND_PATH,
+    "font": FONT_PATH,
+}
+
+# every sound that was loaded by path, None when the file isn't there, so a sound is only decoded once
+# no matter how many buttons play it
+SOUNDS = {}
+
+
+def load_sound(path, volume=1.0):
+    if path not in SOUNDS:
+        sound = None
+        if os.path.exists(path):
+            sound = pygame.mixer.Sound(path)
+            sound.set_volume(volume)
+        SOUNDS[path] = sound
+    return SOUNDS[path]
+
+
+# a surface in the pixel format of the window, which is much faster to blit. before there is a window
+# (the tests, headless runs) it is handed back as it is
+def display_surface(surf):
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert()
+
+
+# raises before anything starts if a file the game needs is missing
+def validate():
+    for kind, path in REQUIRED_FILES.items():
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Missing {kind} file at {path}")
+
+
+# loads everything the menus need once pygame is initialized, so the first menu doesn't wait on the disk.
+# returns the main font
+def preload():
+    load_sound(CLICK_SOUND_PATH, CLICK_VOLUME)
+    load_font(FONT_PATH, SMALL_FONT_SIZE)
+    return load_font(FONT_PATH, FONT_SIZE)
\ No newline at end of file
@@ -0,0 +1,212 @@
+import os
+import sys
+import time
+import json
+import random
+import platform
+import argparse
+
+# the drawing benchmark needs a display, the dummy driver gives us one without a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import torch
+
+from source.variables import *
+from source.control.controller import Controller
+from source.model.platform import Platform
+from source.model.population import Population, course_bounds
+from source.model.brain import BatchedBrain, genome_matrix
+from source.model.rng import RandomStreams
+from source.view.drawing import Drawing
+from source.view.font import load_font
+from source.assets import FONT_PATH, FONT_SIZE
+
+# How fast the hot paths of the game are, run with
+#   python -m source.benchmark --output results.json
+# Every case is one line of the results, with the value in its unit, so two runs can be compared with numbers.
+# --quick uses small sizes and short timings, only good for checking that everything still runs.
+
+# ticks in one run of the tick benchmarks, a second of the game. every run starts again from a fresh generation,
+# so all runs do the same work, and the bots need more than a second to walk off the screen so none of them die
+TICKS = FPS
+
+
+# calls fn until it has run at least min_runs times and min_time seconds, returns (runs, seconds).
+# setup is called before every run and isn't timed
+def measure(fn, min_time, min_runs=1, setup=None):
+    runs = 0
+    elapsed = 0.0
+    while runs < min_runs or elapsed < min_time:
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        elapsed += time.perf_counter() - start
+        runs += 1
+    return runs, elapsed
+
+
+def result(name, size, runs, seconds, unit, per_run=1, **extra):
+    return {"name": name, "size": size, "value": runs * per_run / seconds, "unit": unit,
+            "runs": runs, "seconds": seconds, **extra}
+
+
+# a generation the way the simulation makes it, seeded so every run of the benchmark moves the same bots
+def make_generation(size, seed=0):
+    ai_players, platforms, all_sprites = Controller.setupAI([], pygame.sprite.Group(), population_size=size,
+                                                            streams=RandomStreams(seed))
+    return ai_players, platforms, all_sprites
+
+
+# AIPlayer.move, one bot at a time, a tick is moving every bot that is still alive once
+def bench_ai_player_move(sizes, min_time):
+    results = []
+    for size in sizes:
+        ai_players, platforms, _ = make_generation(size)
+        # a fresh population is everyone back at the start, syncing it puts the bots back there between runs
+        start = Population(size, course_bounds(platforms))
+        moves = 0
+
+        def restart():
+            start.sync_players(ai_players, platforms)
+            for aiplayer in ai_players:
+                aiplayer.nextPlat = None
+
+        def ticks():
+            nonlocal moves
+            for _ in range(TICKS):
+                for aiplayer in ai_players:
+                    if aiplayer.alive:
+                        aiplayer.move(platforms)
+                        moves += 1
+
+        runs, seconds = measure(ticks, min_time, setup=restart)
+        alive = sum(aiplayer.alive for aiplayer in ai_players)
+        results.append(result("ai_player_move", size, runs, seconds, "ticks/s", TICKS, alive=alive))
+        results.append(result("ai_player_move_bots", size, moves, seconds, "moves/s", alive=alive))
+    return results
+
+
+# the same ticks done by the simulation itself, one Population.step with a BatchedBrain for everyone
+def bench_population_step(sizes, min_time):
+    results = []
+    for size in sizes:
+        ai_players, platforms, _ = make_generation(size)
+        bounds = course_bounds(platforms)
+        brain = BatchedBrain(genome_matrix(ai_players))
+        population = None
+
+        def restart():
+            nonlocal population
+            population = Population(size, bounds)
+
+        def ticks():
+            for _ in range(TICKS):
+                population.step(brain)
+
+        runs, seconds = measure(ticks, min_time, setup=restart)
+        alive = int(population.alive.sum())
+        results.append(result("population_step", size, runs, seconds, "ticks/s", TICKS, alive=alive))
+    return results
+
+
+def bench_decide_action(min_time):
+    ai_players, platforms, _ = make_generation(1)
+    runs, seconds = measure(lambda: ai_players[0].decide_action(platforms), min_time)
+    return [result("decide_action", 1, runs, seconds, "calls/s")]
+
+
+def bench_selection(sizes, min_time):
+    results = []
+    rng = random.Random(0)
+    for size in sizes:
+        ai_players, _, _ = make_generation(size)
+        fitness = [(aiplayer, rng.uniform(0, 1000)) for aiplayer in ai_players]
+        methods = {
+            "top_n_selection": lambda: Controller.top_n_selection(list(fitness), num_parents=5),
+            "tournament_selection": lambda: Controller.tournament_selection(fitness, num_parents=5, rng=rng),
+            "roulette_selection": lambda: Controller.roulette_selection(fitness, num_parents=5, rng=rng),
+        }
+        for name, select in methods.items():
+            runs, seconds = measure(select, min_time)
+            results.append(result(name, size, runs, seconds, "selections/s"))
+    return results
+
+
+def bench_generate_platforms(counts, min_time):
+    results = []
+    for count in counts:
+        rng = random.Random(0)
+        runs, seconds = measure(lambda: Platform.generate_platforms(count, rng), min_time)
+        results.append(result("generate_platforms", count, runs, seconds, "courses/s"))
+    return results
+
+
+# one frame of drawAI, with the bots synced from a population that has moved for a second so they are spread out
+def bench_draw_ai(sizes, min_time):
+    results = []
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = load_font(FONT_PATH, FONT_SIZE)
+    for size in sizes:
+        ai_players, platforms, all_sprites = make_generation(size)
+        population = Population(size, course_bounds(platforms))
+        brain = BatchedBrain(genome_matrix(ai_players))
+        for _ in range(TICKS):
+            population.step(brain)
+        population.sync_players(ai_players, platforms)
+
+        runs, seconds = measure(lambda: Drawing.drawAI(ai_players, platforms, all_sprites, screen, 0, font), min_time)
+        alive = int(population.alive.sum())
+        results.append(result("draw_ai", size, runs, seconds, "frames/s", alive=alive))
+        results.append({"name": "draw_ai_frame_time", "size": size, "value": seconds / runs * 1000, "unit": "ms",
+                         "runs": runs, "seconds": seconds, "alive": alive})
+    return results
+
+
+def run_benchmarks(quick=False):
+    if quick:
+        sizes, large, counts, min_time = [10, 50], [100], [50], 0.01
+    else:
+        sizes, large, counts, min_time = [100, 1000, 10000], [1000, 10000, 100000], [1000, 10000], 1.0
+
+    # the same as a headless worker, one thread so the numbers don't depend on what else the machine does
+    torch.set_num_threads(1)
+    pygame.init()
+
+    results = []
+    results += bench_ai_player_move(sizes, min_time)
+    results += bench_population_step(sizes, min_time)
+    results += bench_decide_action(min_time)
+    results += bench_selection(large, min_time)
+    results += bench_generate_platforms(counts, min_time)
+    results += bench_draw_ai(sizes[:2], min_time)
+
+    machine = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "torch": torch.__version__,
+        "pygame": pygame.version.ver,
+    }
+    return {"machine": machine, "quick": quick, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Must Go Up! benchmarks")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--quick", action="store_true", help="small sizes, only checks that everything runs")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.quick)
+    for row in report["results"]:
+        print(f"{row['name']:<24} {row['size']:>7}  {row['value']:>14.1f} {row['unit']}")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit()
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+import numpy as np
+
+
+# Writes the arrays to path as an .npz, first to a temporary file in the same folder which then replaces the old
+# checkpoint in one step. A run killed halfway through writing leaves the previous checkpoint as it was.
+def save_checkpoint(path, arrays):
+    # the process id keeps two runs writing next to each other from sharing a temporary file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# where the fitness cache of a run saved at path is kept, run.npz -> run.cache.npz
+def cache_path_for(path):
+    return os.path.splitext(path)[0] + ".cache.npz"
+
+
+# the arrays of a checkpoint as a dict, read into memory so the file is closed again
+def load_checkpoint(path):
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
\ No newline at end of file
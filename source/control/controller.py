@@ -2,44 +2,112 @@ import pygame
 import sys
 import random
 import time
-import os
+import argparse
+import numpy as np
 
 from source.view.drawing import Drawing as dr
 from source.variables import *
 from source.view.menu import *
-from source.model.ai_player import AIPlayer
+from source.control.fitness_cache import FitnessCache
+from source.view.chart import LiveChart
+from source.control.checkpoint import save_checkpoint, load_checkpoint, cache_path_for
+from source.control.metrics import MetricsLog, fitness_stats
+from source.profiler import profiler, format_totals
 from source.model.player import Player
 from source.model.platform import Platform
-from source.view.font import GameFont
+from source import assets
+
+
+# the speeds of a drawn AI simulation, S goes to the next one. fast steps render_every ticks per drawn frame,
+# turbo steps as many ticks as fit in a frame and doesn't wait for the frame limiter.
+SPEED_MODES = ("realtime", "fast", "turbo")
+
+# torch takes seconds to import and only the AI simulation needs it, so everything that uses torch
+# (the AI players, the population, the brains, the random streams and the workers) is imported in the methods
+# that need it. casual play and the menus start without it, the first generation pays for the import.
 
 
 class Controller:
 
-    def __init__(self, screen, font, clock):
+    # headless means no window at all, the simulation is stepped as fast as the CPU allows with
+    # no drawing, no event pumping and no frame limiter. screen, font and clock can be None then.
+    # a headless run can also split every generation over a number of worker processes.
+    # with a seed every run is repeated exactly, in both the sequential and the parallel mode.
+    # results of genomes are cached across generations and runs of the same controller, cache_size 0 turns that off.
+    # with a cache path the cache is loaded from there and saved after every generation, so other runs reuse it.
+    # bots that stagnate are retired early, see PROGRESS_LIMIT and STILL_LIMIT in variables.py.
+    # with a checkpoint path the run is saved there every checkpoint_every generations (0 only at the end), see resume.
+    # with a metrics path the statistics of every generation are written there as soon as it is done.
+    # profile times the phases of every generation (see profiler.py), a trace path also saves them as a Chrome trace.
+    # render_every is how many ticks the fast speed simulates per drawn frame.
+    def __init__(self, screen, font, clock, headless=False, workers=1, seed=None, cache_size=FITNESS_CACHE_SIZE,
+                 progress_limit=PROGRESS_LIMIT, still_limit=STILL_LIMIT, checkpoint_path=None, checkpoint_every=1,
+                 metrics_path=None, profile=False, trace_path=None, render_every=RENDER_EVERY, cache_path=None):
         self.screen = screen
         self.font = font
         self.clock = clock
+        self.headless = headless
+        self.workers = workers
+        self.evaluator = None
+        self.seed = seed
+        # made the first time they are needed, see streams
+        self._streams = None
+        self.fitness_cache = FitnessCache(cache_size)
+        self.cache_path = cache_path
+        self.progress_limit = progress_limit
+        self.still_limit = still_limit
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.metrics_path = metrics_path
+        self.profile = profile
+        self.trace_path = trace_path
+        self.render_every = render_every
+        # index into SPEED_MODES, kept between generations
+        self.speed_mode = 0
+        # seconds and calls of every phase, one dict per generation of the last profiled run
+        self.phase_totals = []
+
+        # throughput of the last run, simulation ticks per second of wall-clock time
+        self.ticks_simulated = 0
+        self.ticks_per_second = 0.0
+        # share of the bots of the last run that came out of the fitness cache
+        self.cache_hit_rate = 0.0
+        # best and average fitness of the run so far, shown while the simulation is drawn
+        self.live_chart = None
+
+    # the random streams of the run, made from the seed the first time something draws from them
+    @property
+    def streams(self):
+        if self._streams is None:
+            from source.model.rng import RandomStreams
+            self._streams = RandomStreams(self.seed)
+        return self._streams
+
+    @streams.setter
+    def streams(self, streams):
+        self._streams = streams
 
     @staticmethod
     def top_n_selection(results, num_parents=5):
         results.sort(key=lambda x: x[1], reverse=True)
         return [(p, fit) for p, fit in results[:num_parents]]
 
+    # the random selection methods draw from rng, the global random module unless a seeded stream is given
     @staticmethod
-    def tournament_selection(results, num_parents=5, tournament_size=4):
+    def tournament_selection(results, num_parents=5, tournament_size=4, rng=random):
         selected = []
         for _ in range(num_parents):
-            tournament = random.sample(results, tournament_size)
+            tournament = rng.sample(results, tournament_size)
             winner = max(tournament, key=lambda x: x[1])
             selected.append((winner[0], winner[1]))
         return selected
 
     @staticmethod
-    def roulette_selection(results, num_parents=5):
+    def roulette_selection(results, num_parents=5, rng=random):
         total_fitness = sum(max(0.001, fit) for _, fit in results)
         selected = []
         for _ in range(num_parents):
-            threshold = random.uniform(0, total_fitness)
+            threshold = rng.uniform(0, total_fitness)
             curr_sum = 0
             for player, fit in results:
                 curr_sum += max(0.001, fit)
@@ -50,18 +118,18 @@ class Controller:
 
     # minimum color value to avoid colors that are too dark, because of black background
     @staticmethod
-    def generate_random_color():
+    def generate_random_color(rng=random):
         return (
-            random.randint(50, 255),
-            random.randint(50, 255),
-            random.randint(50, 255)
+            rng.randint(50, 255),
+            rng.randint(50, 255),
+            rng.randint(50, 255)
         )
 
     @staticmethod
-    def mutate_color(color):
-        r = min(255, max(50, color[0] + random.randint(-15, 15)))
-        g = min(255, max(50, color[1] + random.randint(-15, 15)))
-        b = min(255, max(50, color[2] + random.randint(-15, 15)))
+    def mutate_color(color, rng=random):
+        r = min(255, max(50, color[0] + rng.randint(-15, 15)))
+        g = min(255, max(50, color[1] + rng.randint(-15, 15)))
+        b = min(255, max(50, color[2] + rng.randint(-15, 15)))
         return (r, g, b)
 
     # setting up the singular player mode
@@ -78,10 +146,23 @@ class Controller:
         return (players, platforms, all_sprites)
 
     # setting up the simulation mode
+    # every random choice comes from the given RandomStreams, the course is generated from course_seed
+    # (or a new seed from the course stream when there is none)
     @staticmethod
-    def setupAI(ai_players, all_sprites, parents=None, population_size=100, mutation_rate=0.05):
+    def setupAI(ai_players, all_sprites, parents=None, population_size=100, mutation_rate=0.05,
+                streams=None, course_seed=None):
+        import torch
+        from source.model.ai_player import AIPlayer
+        from source.model.genome import breed, random_genomes
+        from source.model.rng import RandomStreams
+
+        if streams is None:
+            streams = RandomStreams()
+        if course_seed is None:
+            course_seed = streams.course.getrandbits(64)
+
         # this is where you can decide how many platforms you want to generate.
-        platforms_list = Platform.generate_platforms(50)
+        platforms_list = Platform.generate_platforms(50, random.Random(course_seed))
         for plat in platforms_list:
             all_sprites.add(plat)
 
@@ -92,15 +173,24 @@ class Controller:
         # if no parents are given, it is the first generation, where most things are random.
         # if parents are given, the AIPlayer copies the weights from the parent and mutates them.
         # The color is also mutated, to showcase that the weights were also mutated.
-        for _ in range(population_size):
-            aiplayer = AIPlayer()
-            if parents is not None and len(parents) > 0:
-                chosen_parent, _ = random.choice(parents)
-                aiplayer.copy_weights_from(chosen_parent)
-                aiplayer.mutate_weights(mutation_rate)
-                aiplayer.set_color(Controller.mutate_color(chosen_parent.get_color()))
-            else:
-                aiplayer.set_color(Controller.generate_random_color())
+        # the weights of the whole generation are one genome matrix, copied and mutated in one go,
+        # every AIPlayer just gets its row of it.
+        if parents is not None and len(parents) > 0:
+            choices = []
+            colors = []
+            for _ in range(population_size):
+                choice = streams.breeding.randrange(len(parents))
+                choices.append(choice)
+                colors.append(Controller.mutate_color(parents[choice][0].get_color(), streams.breeding))
+            parent_genomes = torch.stack([parent.genome for parent, _ in parents])
+            genomes = breed(parent_genomes, choices, mutation_rate, streams.mutation)
+        else:
+            genomes = random_genomes(population_size, streams.mutation)
+            colors = [Controller.generate_random_color(streams.breeding) for _ in range(population_size)]
+
+        for genome, color in zip(genomes, colors):
+            aiplayer = AIPlayer(genome=genome)
+            aiplayer.set_color(color)
 
             # In either case we put them in the middle and sync the rects
             aiplayer.pos = vec(WIDTH / 2, first_platform.rect.top)
@@ -114,7 +204,7 @@ class Controller:
 
         return (ai_players, platforms_list, all_sprites)
 
-    # Game loop for singular player mode.
+    # Game loop for singular player mode, a scene (see start_game).
     def casual_play(self):
         all_sprites = pygame.sprite.Group()
         platforms = []
@@ -146,19 +236,64 @@ class Controller:
             dr.draw(players, platforms, all_sprites, self.screen)
             self.clock.tick(FPS)
         # if reached here, user pressed q, go back to the main menu
-        self.start_game()
+        return self.main_menu
+
+    # Runs all the generations and applies the selection method, returns the fitness history of the run.
+    # with a checkpoint state (see resume) the run carries on after the generation it was saved at.
+    def evolve(self, generations, population_size, tick_limit, selection_method, checkpoint=None):
+        from source.model.rng import RandomStreams
+        from source.control.parallel import ParallelEvaluator
 
-    # Simulation where the generations are ran then analyzed and the simulation summary menu showcases it
-    def actual_simulation(self, generations, population_size, time_limit, selection_method):
         best_overall_player = None
         best_overall_fitness = float('-inf')
         parents = []
         best_fitness_per_gen = []
         avg_fitness_per_gen = []
-
-        for gen in range(generations):
-            # Results from one generation
-            results, user_quit = self.run_generation(population_size, gen, time_limit, parents=parents)
+        first_gen = 0
+        total_ticks = 0
+        total_time = 0.0
+        if self.cache_path is not None:
+            self.fitness_cache.load(self.cache_path)
+        hits_before = self.fitness_cache.hits
+        lookups_before = self.fitness_cache.hits + self.fitness_cache.misses
+
+        if checkpoint is None:
+            # fresh streams for every run, so the same seed gives the same run every time
+            self.streams = RandomStreams(self.seed)
+            if self.headless:
+                print(f"Seed: {self.streams.seed}")
+        else:
+            first_gen, parents, best_fitness_per_gen, avg_fitness_per_gen = self.restore_checkpoint(checkpoint)
+            if self.headless:
+                print(f"Seed: {self.streams.seed}, resuming after generation {first_gen}")
+
+        # the worker processes are started once for the whole run, only a headless run can use them
+        if self.headless and self.workers > 1:
+            self.evaluator = ParallelEvaluator(self.workers)
+
+        profiler.reset(enabled=self.profile, trace=self.trace_path is not None)
+        self.phase_totals = []
+
+        # a drawn run shows its fitness so far, including the generations before a checkpoint
+        if not self.headless:
+            self.live_chart = LiveChart()
+            for best, avg in zip(best_fitness_per_gen, avg_fitness_per_gen):
+                self.live_chart.add(best, avg)
+
+        # a resumed run adds to the log of the run it carries on, from the generation of its checkpoint
+        metrics = None
+        if self.metrics_path is not None:
+            metrics = MetricsLog(self.metrics_path, append=checkpoint is not None, keep_until=first_gen)
+
+        for gen in range(first_gen, generations):
+            # Results from one generation, timed so we can report how many ticks per second we simulate
+            gen_start = time.perf_counter()
+            gen_hits = self.fitness_cache.hits
+            with profiler.phase("generation"):
+                results, user_quit, ticks = self.run_generation(population_size, gen, tick_limit, parents=parents)
+            gen_time = time.perf_counter() - gen_start
+            total_ticks += ticks
+            total_time += gen_time
 
             # Preparing information that will be sent to the summary menu
             results.sort(key=lambda x: x[1], reverse=True)
@@ -167,6 +302,33 @@ class Controller:
             avg_fitness = sum(fitness_values) / len(fitness_values)
             best_fitness_per_gen.append(best_fitness)
             avg_fitness_per_gen.append(avg_fitness)
+            if self.live_chart is not None:
+                self.live_chart.add(best_fitness, avg_fitness)
+
+            gen_cached = self.fitness_cache.hits - gen_hits
+
+            # without a window the only feedback is the terminal
+            if self.headless:
+                print(f"Gen {gen + 1}/{generations}: best fitness={best_fitness:.2f}, average fitness={avg_fitness:.2f}, "
+                      f"ticks={ticks}, {ticks / gen_time:.0f} ticks/s, cached={gen_cached}/{population_size}")
+
+            if profiler.enabled:
+                totals = profiler.take_totals()
+                self.phase_totals.append(totals)
+                if self.headless:
+                    print(f"    {format_totals(totals)}")
+
+            if metrics is not None:
+                record = {"generation": gen + 1}
+                record.update(fitness_stats(fitness_values))
+                record.update({
+                    "alive": sum(1 for player, _ in results if player.alive),
+                    "ticks": ticks,
+                    "wall_time": gen_time,
+                    "ticks_per_second": ticks / gen_time if gen_time > 0 else 0.0,
+                    "cached": gen_cached,
+                })
+                metrics.write(record)
 
             # this isn't used now but could be later.
             best_player = results[0][0]
@@ -178,15 +340,110 @@ class Controller:
             if selection_method == "top_n":
                 parents = Controller.top_n_selection(results, num_parents=5)
             elif selection_method == "tournament":
-                parents = Controller.tournament_selection(results, num_parents=5)
+                parents = Controller.tournament_selection(results, num_parents=5, rng=self.streams.selection)
             elif selection_method == "roulette":
-                parents = Controller.roulette_selection(results, num_parents=5)
+                parents = Controller.roulette_selection(results, num_parents=5, rng=self.streams.selection)
 
+            # a generation cut short by the user isn't saved, the last checkpoint stays the one before it
             if user_quit:
                 break
 
+            # checkpoint_every 0 only saves the last generation
+            periodic = self.checkpoint_every > 0 and (gen + 1) % self.checkpoint_every == 0
+            if self.checkpoint_path is not None and (periodic or gen + 1 == generations):
+                self.write_checkpoint(gen, population_size, tick_limit, selection_method, results, parents,
+                                      best_fitness_per_gen, avg_fitness_per_gen)
+            # every generation, so generations done after the last checkpoint are still cached if the run is killed
+            if self.cache_path is not None:
+                self.fitness_cache.save(self.cache_path)
+
+        if self.evaluator is not None:
+            self.evaluator.close()
+            self.evaluator = None
+        if metrics is not None:
+            metrics.close()
+        if self.trace_path is not None:
+            profiler.write_trace(self.trace_path)
+        profiler.reset()
+
+        self.ticks_simulated = total_ticks
+        self.ticks_per_second = total_ticks / total_time if total_time > 0 else 0.0
+        lookups = self.fitness_cache.hits + self.fitness_cache.misses - lookups_before
+        self.cache_hit_rate = (self.fitness_cache.hits - hits_before) / lookups if lookups > 0 else 0.0
+        if self.headless:
+            print(f"Fitness cache hit rate: {self.cache_hit_rate:.1%}")
+
+        return best_fitness_per_gen, avg_fitness_per_gen
+
+    # Carries on with the run saved at path until it has the given number of generations. The settings of the run
+    # (population size, tick limit, selection method, stagnation limits) come from the checkpoint, and since the
+    # random streams are saved too the rest of the run is the same as if it was never stopped.
+    def resume(self, path, generations):
+        checkpoint = load_checkpoint(path)
+        return self.evolve(generations, int(checkpoint["population_size"]), int(checkpoint["tick_limit"]),
+                           str(checkpoint["selection_method"]), checkpoint=checkpoint)
+
+    # everything needed to carry on with the run after generation gen, written atomically (see checkpoint.py).
+    # the population of the last generation is saved too, so its best brains can be looked at later.
+    def write_checkpoint(self, gen, population_size, tick_limit, selection_method, results, parents,
+                         best_fitness_per_gen, avg_fitness_per_gen):
+        from source.model.brain import genome_matrix
+
+        arrays = {
+            "generation": np.array(gen + 1),
+            "population_size": np.array(population_size),
+            "tick_limit": np.array(tick_limit),
+            "selection_method": np.array(selection_method),
+            "progress_limit": np.array(self.progress_limit or 0),
+            "still_limit": np.array(self.still_limit or 0),
+            "genomes": genome_matrix([p for p, _ in results]).numpy(),
+            "colors": np.array([p.get_color() for p, _ in results], dtype=np.uint8),
+            "fitness": np.array([fit for _, fit in results], dtype=np.float64),
+            "parent_genomes": genome_matrix([p for p, _ in parents]).numpy(),
+            "parent_colors": np.array([p.get_color() for p, _ in parents], dtype=np.uint8),
+            "parent_fitness": np.array([fit for _, fit in parents], dtype=np.float64),
+            "best_fitness": np.array(best_fitness_per_gen, dtype=np.float64),
+            "avg_fitness": np.array(avg_fitness_per_gen, dtype=np.float64),
+        }
+        for name, value in self.streams.get_state().items():
+            arrays["rng_" + name] = value
+        save_checkpoint(self.checkpoint_path, arrays)
+
+    # the other way around, puts the streams and settings back and returns
+    # (generations done, parents, best fitness per gen, average fitness per gen)
+    def restore_checkpoint(self, checkpoint):
+        import torch
+        from source.model.ai_player import AIPlayer
+        from source.model.rng import RandomStreams
+
+        self.streams = RandomStreams.from_state({name[4:]: value for name, value in checkpoint.items()
+                                                 if name.startswith("rng_")})
+        self.seed = self.streams.seed
+        self.progress_limit = int(checkpoint["progress_limit"])
+        self.still_limit = int(checkpoint["still_limit"])
+
+        parents = []
+        for genome, color, fit in zip(checkpoint["parent_genomes"], checkpoint["parent_colors"],
+                                      checkpoint["parent_fitness"]):
+            parent = AIPlayer(genome=torch.from_numpy(genome.copy()))
+            parent.set_color(tuple(int(c) for c in color))
+            parents.append((parent, float(fit)))
+
+        return (int(checkpoint["generation"]), parents,
+                checkpoint["best_fitness"].tolist(), checkpoint["avg_fitness"].tolist())
+
+    # Simulation where the generations are ran then analyzed and the simulation summary menu showcases it,
+    # a scene (see start_game)
+    def actual_simulation(self, generations, population_size, tick_limit, selection_method):
+        best_fitness_per_gen, avg_fitness_per_gen = self.evolve(generations, population_size, tick_limit, selection_method)
+
         # the creation of the summary menu
-        summary_text = [f"Selection Method: {selection_method}"]
+        summary_text = [
+            f"Selection Method: {selection_method}",
+            f"Simulated {self.ticks_simulated} ticks at {self.ticks_per_second:.0f} ticks/s",
+            f"Seed: {self.streams.seed}",
+            f"Fitness cache hit rate: {self.cache_hit_rate:.1%}"
+        ]
         summary_menu = SimulationSummaryMenu(
             self.screen, self.font, self.clock,
             summary_lines=summary_text,
@@ -196,119 +453,254 @@ class Controller:
         button_clicked = summary_menu.run()
         if button_clicked == 0:
             # main menu
-            self.start_game()
-        elif button_clicked == 1:
-            pygame.quit()
-            sys.exit()
+            return self.main_menu
+        # quit
+        return None
 
     # function that runs one generation
-    def run_generation(self, population_size, gen_num, time_limit, parents=None):
+    # the generation budget is counted in simulation ticks, not seconds, so a generation does the same amount of work
+    # whether it is drawn at 60 FPS or run headless as fast as possible. Returns the results, if the user quit,
+    # and how many ticks were actually simulated.
+    def run_generation(self, population_size, gen_num, tick_limit, parents=None):
+        from source.model.population import Population, course_bounds
+        from source.model.brain import BatchedBrain, genome_matrix, genome_digests
+        from source.model.rng import genome_keys
+
         # these here could also be just normal array.
         all_sprites = pygame.sprite.Group()
         platforms = []
         ai_players = []
 
-        # MUTATION RATE IS CHOSEN HERE FOR THE AI PLAYERS.
-        ai_players, platforms, all_sprites = self.setupAI(
-            # 0.05 mutation rate is good, 
-            # 0.01 is too low, 
-            # 0.1 is also good, 
-            # but 0.2 is good, 
-            # 0.3 is good,
-            # 0.4 is good but a bit too much,
-            # 0.5 is too much
-            # 0.05 is the "strictest" mutation rate, mutating only a little bit but still producing good results.
-            # going above 0.3 is a bit harmful
-            ai_players, all_sprites, parents=parents, population_size=population_size, mutation_rate=0.2
-        )
+        # the course is part of the fitness cache key, so its seed is drawn here instead of inside setupAI
+        course_seed = self.streams.course.getrandbits(64)
 
-        start_time = time.time()
-        alive_players = list(ai_players)
-        done = False
+        # MUTATION RATE IS CHOSEN HERE FOR THE AI PLAYERS.
+        with profiler.phase("setup"):
+            ai_players, platforms, all_sprites = self.setupAI(
+                # 0.05 mutation rate is good, 
+                # 0.01 is too low, 
+                # 0.1 is also good, 
+                # but 0.2 is good, 
+                # 0.3 is good,
+                # 0.4 is good but a bit too much,
+                # 0.5 is too much
+                # 0.05 is the "strictest" mutation rate, mutating only a little bit but still producing good results.
+                # going above 0.3 is a bit harmful
+                ai_players, all_sprites, parents=parents, population_size=population_size, mutation_rate=0.2,
+                streams=self.streams, course_seed=course_seed
+            )
+
+        # the whole generation is moved as one population of arrays instead of one AIPlayer.move per bot,
+        # the AIPlayers are only synced from it when they need to be drawn and at the end.
+        # all the brains are stacked too, so deciding is one batched forward pass for every grounded bot.
+        bounds = course_bounds(platforms)
+        genomes = genome_matrix(ai_players)
+        # every bot explores with a noise key made from its genome and the course, so it behaves the same in whichever
+        # process it is simulated, and its result only depends on (genome, course, tick limit, stagnation limits),
+        # the fitness cache key
+        digests = genome_digests(genomes)
+        noise_keys = genome_keys(course_seed, digests)
+        cache_keys = [(digest, course_seed, tick_limit, self.progress_limit, self.still_limit)
+                      for digest in digests.tolist()]
         user_quit = False
 
-        while not done:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        user_quit = True
+        if self.headless:
+            # there is nothing to draw and no window to get events from, so the generation is simulated in one go
+            with profiler.phase("evaluate"):
+                population, ticks = self.evaluate_headless(bounds, genomes.numpy(), noise_keys, cache_keys, tick_limit)
+        else:
+            population = Population(population_size, bounds, self.progress_limit, self.still_limit)
+            policy = BatchedBrain(genomes, noise_keys)
+            ticks = 0
+            done = False
+
+            while not done:
+                with profiler.phase("events"):
+                    for event in pygame.event.get():
+                        if event.type == pygame.QUIT:
+                            pygame.quit()
+                            sys.exit()
+                        elif event.type == pygame.KEYDOWN:
+                            if event.key == pygame.K_q:
+                                user_quit = True
+                                done = True
+                            elif event.key == pygame.K_s:
+                                self.speed_mode = (self.speed_mode + 1) % len(SPEED_MODES)
+
+                # move all the players, as many ticks as the speed wants before the next frame
+                mode = SPEED_MODES[self.speed_mode]
+                frame_start = time.perf_counter()
+                frame_ticks = 0
+                while not done:
+                    population.step(policy)
+                    ticks += 1
+                    frame_ticks += 1
+
+                    # we end the generation if the tick limit is reached or all players are dead or stagnant
+                    if ticks >= tick_limit or not population.running():
                         done = True
-
-            # move all the players 
-            for ap in alive_players:
-                ap.move(platforms)
-
-            elapsed = time.time() - start_time
-            alive_players = [p for p in alive_players if p.alive]
-
-            # we end the generation if the time limit is reached or all players are dead
-            if elapsed >= time_limit or not alive_players:
-                done = True
-            else:
-                # else we contiinue drawing and the simulation
-                dr.drawAI(ai_players, platforms, all_sprites, self.screen, gen_num, self.font)
-                self.clock.tick(FPS)
+                    elif mode == "realtime" or (mode == "fast" and frame_ticks >= self.render_every):
+                        break
+                    elif mode == "turbo" and time.perf_counter() - frame_start >= 1 / FPS:
+                        break
+
+                if not done:
+                    # else we contiinue drawing and the simulation.
+                    # the speed on screen is the ticks of this frame times the frames per second we really get
+                    fps = self.clock.get_fps()
+                    speed = frame_ticks * fps / FPS if fps > 0 else float(frame_ticks)
+                    with profiler.phase("draw"):
+                        population.sync_players(ai_players, platforms)
+                        dr.drawAI(ai_players, platforms, all_sprites, self.screen, gen_num, self.font, speed,
+                                  self.live_chart)
+                    with profiler.phase("clock"):
+                        # turbo only measures the frame rate, it never waits
+                        self.clock.tick(FPS if mode != "turbo" else 0)
+
+            # every bot is drawn so none are skipped, but a finished generation can still fill the cache
+            if not user_quit:
+                for key, row in zip(cache_keys, population.rows(np.arange(population_size))):
+                    self.fitness_cache.put(key, row)
 
         # returning the results of the generation.
+        population.sync_players(ai_players, platforms)
         results = [(ap, ap.fitness) for ap in ai_players]
-        return results, user_quit
-
-    # the main function that runs the game, it is the entry point of the game with all the menus and gameplay
+        return results, user_quit, ticks
+
+    # Simulates only the bots whose results aren't in the fitness cache, split over the worker processes if we
+    # have them, and fills the rest in from the cache. Returns the population and the ticks that were simulated.
+    def evaluate_headless(self, bounds, genomes, noise_keys, cache_keys, tick_limit):
+        from source.model.population import Population
+        from source.control.parallel import simulate
+
+        population = Population(len(genomes), bounds, self.progress_limit, self.still_limit)
+        cached = [self.fitness_cache.get(key) for key in cache_keys]
+        hits = [i for i, row in enumerate(cached) if row is not None]
+        misses = np.array([i for i, row in enumerate(cached) if row is None], dtype=np.int64)
+        population.set_rows(hits, [cached[i] for i in hits])
+
+        ticks = 0
+        if len(misses) > 0:
+            if self.evaluator is not None:
+                simulated, ticks = self.evaluator.evaluate(bounds, genomes[misses], noise_keys[misses], tick_limit,
+                                                           self.progress_limit, self.still_limit)
+            else:
+                simulated, ticks = simulate(bounds, genomes[misses], noise_keys[misses], tick_limit,
+                                            self.progress_limit, self.still_limit)
+            rows = simulated.rows(np.arange(len(misses)))
+            population.set_rows(misses, rows)
+            for i, row in zip(misses.tolist(), rows):
+                self.fitness_cache.put(cache_keys[i], row)
+        return population, ticks
+
+    # the main function that runs the game, it is the entry point of the game with all the menus and gameplay.
+    # Every screen of the game is a scene, a method that runs until the user leaves it and returns the scene to go
+    # to next, or None to quit. Scenes are run one after the other in this loop instead of calling each other,
+    # so the stack doesn't grow and everything a scene made (menus, sprites, a whole run) is freed when it returns.
     def start_game(self):
-        menu = MainMenu(self.screen, self.font, self.clock)
-        button_clicked = menu.run()
-
-        # MAIN SETTINGS FOR SIMULATION
-        time_limit = 20
-        # POPULATION SIZE SHOULD BE MINIMUM OF WHATEVER TOURNAMENT SIZE IS, OR IT WILL NOT WORK
-        population_size = 100
-        number_of_generations = 150
-
+        scene = self.main_menu
+        while scene is not None:
+            scene = scene()
+        pygame.quit()
+        sys.exit()
+
+    def main_menu(self):
+        button_clicked = MainMenu(self.screen, self.font, self.clock).run()
         if button_clicked == 0:
-            self.casual_play()
+            return self.casual_play
         elif button_clicked == 1:
-            ai_menu = AISimulationMenu(self.screen, self.font, self.clock)
-            ai_button_clicked = ai_menu.run()
-            if ai_button_clicked == 0:
-                self.actual_simulation(number_of_generations, population_size, time_limit, selection_method="top_n")
-            elif ai_button_clicked == 1:
-                self.actual_simulation(number_of_generations, population_size, time_limit, selection_method="tournament")
-            elif ai_button_clicked == 2:
-                self.actual_simulation(number_of_generations, population_size, time_limit, selection_method="roulette")
-            elif ai_button_clicked == 3:
-                self.start_game()
+            return self.ai_menu
         elif button_clicked == 2:
-            instructions = InstructionsMenu(self.screen, self.font, self.clock)
-            instructions.run()
-            self.start_game()
-        elif button_clicked == 3:
-            pygame.quit()
-            sys.exit()
+            return self.instructions
+        # quit
+        return None
 
-if __name__ == "__main__":
+    def ai_menu(self):
+        ai_button_clicked = AISimulationMenu(self.screen, self.font, self.clock).run()
+        if ai_button_clicked == 3:
+            # back
+            return self.main_menu
+        selection_method = ("top_n", "tournament", "roulette")[ai_button_clicked]
+
+        # MAIN SETTINGS FOR SIMULATION, found in variables.py
+        return lambda: self.actual_simulation(NUMBER_OF_GENERATIONS, POPULATION_SIZE, TICK_LIMIT,
+                                              selection_method=selection_method)
 
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    def instructions(self):
+        InstructionsMenu(self.screen, self.font, self.clock).run()
+        return self.main_menu
+
+if __name__ == "__main__":
 
-    # checking if sound file is present
-    sound_check_path = os.path.join(base_dir, "assets", "sounds", "click.mp3")
-    if not os.path.exists(sound_check_path):
-        raise FileNotFoundError(f"Missing sound file at {sound_check_path}")
-    
-    # checking if font file is present
-    font_path = os.path.join(base_dir, "assets", "font", "Pixellari.ttf")
-    if not os.path.exists(font_path):
-        raise FileNotFoundError(f"Missing font file at {font_path}")
+    parser = argparse.ArgumentParser(description="Must Go Up!")
+    parser.add_argument("--headless", action="store_true",
+                        help="train the AI without a display, as fast as the CPU allows")
+    parser.add_argument("--selection", choices=["top_n", "tournament", "roulette"], default="top_n")
+    parser.add_argument("--generations", type=int, default=NUMBER_OF_GENERATIONS)
+    parser.add_argument("--population", type=int, default=POPULATION_SIZE)
+    parser.add_argument("--ticks", type=int, default=TICK_LIMIT, help="simulation ticks per generation")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes to split every generation over, headless only")
+    parser.add_argument("--seed", type=int, default=None, help="seed to repeat a run exactly")
+    parser.add_argument("--cache-size", type=int, default=FITNESS_CACHE_SIZE,
+                        help="how many genome results to remember, 0 turns the fitness cache off")
+    parser.add_argument("--fitness-cache", default=None,
+                        help="keep the fitness cache in this .npz file, so running the same seed again reuses results. "
+                             "with --checkpoint or --resume it is kept next to the checkpoint unless given")
+    parser.add_argument("--progress-limit", type=int, default=PROGRESS_LIMIT,
+                        help="retire a bot after this many ticks without a new highest platform, 0 is off")
+    parser.add_argument("--still-limit", type=int, default=STILL_LIMIT,
+                        help="retire a bot after this many ticks without moving, 0 is off")
+    parser.add_argument("--checkpoint", default=None, help="save the run to this .npz file as it goes")
+    parser.add_argument("--checkpoint-every", type=int, default=1, help="generations between checkpoints, 0 only saves at the end")
+    parser.add_argument("--metrics", default=None,
+                        help="write the statistics of every generation to this .jsonl or .csv file as the run goes")
+    parser.add_argument("--render-every", type=int, default=RENDER_EVERY,
+                        help="ticks simulated per drawn frame at the fast speed of the AI simulation")
+    parser.add_argument("--profile", action="store_true", help="time the phases of every generation")
+    parser.add_argument("--trace", default=None,
+                        help="save every timed phase to this Chrome trace JSON, open it in chrome://tracing or Perfetto")
+    parser.add_argument("--resume", default=None,
+                        help="carry on with the run saved in this checkpoint up to --generations, headless only")
+    args = parser.parse_args()
+
+    if args.resume is not None and not args.headless:
+        parser.error("--resume only works together with --headless")
+    if args.checkpoint_every < 0:
+        parser.error("--checkpoint-every can't be negative")
+
+    if args.headless:
+        # no window, font or clock are needed to train, so the display is never created.
+        # a resumed run keeps saving to the file it was resumed from unless told otherwise
+        checkpoint_path = args.checkpoint if args.checkpoint is not None else args.resume
+        cache_path = args.fitness_cache
+        if cache_path is None and checkpoint_path is not None:
+            cache_path = cache_path_for(checkpoint_path)
+        c = Controller(None, None, None, headless=True, workers=args.workers, seed=args.seed,
+                       cache_size=args.cache_size, cache_path=cache_path, progress_limit=args.progress_limit, still_limit=args.still_limit,
+                       checkpoint_path=checkpoint_path, checkpoint_every=args.checkpoint_every,
+                       metrics_path=args.metrics, profile=args.profile, trace_path=args.trace)
+        if args.resume is not None:
+            c.resume(args.resume, args.generations)
+        else:
+            c.evolve(args.generations, args.population, args.ticks, args.selection)
+        sys.exit()
+
+    # checking that the sound and font files are present
+    assets.validate()
 
     # initializing pygame and creating the controller
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Must Go Up!")
-    font = GameFont(font_path, 27)
+    # the sounds and fonts are loaded once here and shared by every menu after
+    font = assets.preload()
     clock = pygame.time.Clock()
 
     # creating the controller and starting the main function.
-    c = Controller(screen, font, clock)
+    c = Controller(screen, font, clock, seed=args.seed, cache_size=args.cache_size, cache_path=args.fitness_cache,
+                   progress_limit=args.progress_limit, still_limit=args.still_limit,
+                   checkpoint_path=args.checkpoint, checkpoint_every=args.checkpoint_every,
+                   metrics_path=args.metrics, profile=args.profile, trace_path=args.trace,
+                   render_every=args.render_every)
     c.start_game()
\ No newline at end of file
@@ -0,0 +1,66 @@
+import os
+from collections import OrderedDict
+import numpy as np
+from source.control.checkpoint import save_checkpoint, load_checkpoint
+
+# how None (a stagnation rule turned off) is written in a saved key
+NONE_KEY = 2 ** 64 - 1
+
+
+# Remembers how a genome did, so an identical brain doesn't have to be simulated again.
+# Keys are (genome digest, course seed, tick limit), everything the result of a bot depends on,
+# and the values are the final rows of the bots (see Population.rows).
+# When it is full the least recently used entry is dropped.
+# Every generation is on a new course, so a run never hits its own entries. They are hit by running the same seed
+# again or by a resumed run redoing the generations after its last checkpoint, which is why it can be saved to disk.
+class FitnessCache:
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # the cached value of key or None, counting hits and misses
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    # writes the entries to path (atomically, see checkpoint.py), least recently used first so a load keeps the order
+    def save(self, path):
+        keys = [[NONE_KEY if v is None else v for v in key] for key in self.entries]
+        rows = list(self.entries.values())
+        save_checkpoint(path, {
+            "keys": np.array(keys, dtype=np.uint64).reshape(len(keys), -1),
+            # every value of a row is a float, int or bool, all exact as a float64
+            "rows": np.array(rows, dtype=np.float64).reshape(len(rows), -1),
+        })
+
+    # adds the entries saved at path, nothing happens if there is no file yet
+    def load(self, path):
+        if not os.path.exists(path):
+            return
+        saved = load_checkpoint(path)
+        for key, row in zip(saved["keys"].tolist(), saved["rows"].tolist()):
+            self.put(tuple(None if v == NONE_KEY else v for v in key), tuple(row))
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
\ No newline at end of file
@@ -0,0 +1,78 @@
+import os
+import csv
+import json
+import numpy as np
+
+# the columns of every generation, in the order they are written
+FIELDS = ("generation", "best", "mean", "median", "p10", "p25", "p75", "p90",
+          "alive", "ticks", "wall_time", "ticks_per_second", "cached")
+
+
+# the fitness statistics of one generation
+def fitness_stats(fitness_values):
+    values = np.asarray(fitness_values, dtype=np.float64)
+    p10, p25, median, p75, p90 = np.percentile(values, [10, 25, 50, 75, 90]).tolist()
+    return {"best": float(values.max()), "mean": float(values.mean()), "median": median,
+            "p10": p10, "p25": p25, "p75": p75, "p90": p90}
+
+
+# Rewrites an existing log without the lines of the generations after generation.
+# A run killed after its last checkpoint already logged the generations it is going to run again when resumed,
+# and so has one that ended with Q, so those lines go before the resumed run adds its own.
+# A half written last line from a killed run is dropped too.
+def drop_after(path, generation):
+    if not os.path.exists(path):
+        return
+    with open(path, newline="") as f:
+        lines = f.readlines()
+
+    if path.lower().endswith(".csv"):
+        kept = lines[:1]
+        for line in lines[1:]:
+            row = next(csv.reader([line]), [])
+            if line.endswith("\n") and len(row) == len(FIELDS) and int(row[0]) <= generation:
+                kept.append(line)
+    else:
+        kept = []
+        for line in lines:
+            if not line.endswith("\n"):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record["generation"] <= generation:
+                kept.append(line)
+
+    with open(path, "w", newline="") as f:
+        f.writelines(kept)
+
+
+# Writes one line per generation as soon as it is done, so a long run can be followed with tail -f.
+# Files ending in .csv get a csv with a header, everything else gets one JSON object per line.
+# Nothing is kept in memory and every line is flushed right away.
+class MetricsLog:
+
+    # append carries on with an existing log, for resumed runs. with keep_until the lines after that generation
+    # are dropped first (see drop_after)
+    def __init__(self, path, append=False, keep_until=None):
+        self.path = path
+        if append and keep_until is not None:
+            drop_after(path, keep_until)
+        self.file = open(path, "a" if append else "w", newline="")
+        self.csv = None
+        if path.lower().endswith(".csv"):
+            self.csv = csv.DictWriter(self.file, fieldnames=FIELDS)
+            # a log that already has lines already has its header
+            if self.file.tell() == 0:
+                self.csv.writeheader()
+
+    def write(self, record):
+        if self.csv is not None:
+            self.csv.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
\ No newline at end of file
@@ -0,0 +1,55 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import torch
+
+from source.model.population import Population
+from source.model.brain import BatchedBrain
+
+
+# Runs a generation to the end without drawing anything, returns the final population and the ticks simulated.
+# The end is the tick limit, or when every bot is dead or retired for stagnation (see Population).
+# This is all a worker process does, and also what a headless run does when there are no workers, so both give
+# exactly the same results.
+def simulate(bounds, genomes, noise_keys, tick_limit, progress_limit=None, still_limit=None):
+    population = Population(len(genomes), bounds, progress_limit, still_limit)
+    brain = BatchedBrain(genomes, noise_keys)
+    ticks = 0
+    while ticks < tick_limit and population.running():
+        population.step(brain)
+        ticks += 1
+    return population, ticks
+
+
+def init_worker():
+    # each worker gets one core, torch spreading itself over every core in every worker would just fight
+    torch.set_num_threads(1)
+
+
+# Splits the population of a generation into shards and simulates them in a pool of processes.
+# Bots never interact, and every bot keeps its own exploration noise key, so the shards can be joined back
+# into the exact population a single process would have produced.
+class ParallelEvaluator:
+
+    def __init__(self, workers):
+        self.workers = workers
+        # spawn instead of fork, forking a process that already used torch's thread pool can hang the children
+        self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=init_worker)
+
+    def evaluate(self, bounds, genomes, noise_keys, tick_limit, progress_limit=None, still_limit=None):
+        genomes = np.asarray(genomes, dtype=np.float32)
+        shards = [rows for rows in np.array_split(np.arange(len(genomes)), self.workers) if len(rows) > 0]
+        futures = [self.pool.submit(simulate, bounds, genomes[rows], noise_keys[rows], tick_limit,
+                                    progress_limit, still_limit) for rows in shards]
+
+        # shards are contiguous and in order, so joining them keeps every bot at its index.
+        # the generation lasts as long as its longest shard, the others only ended early because all their bots
+        # died or were retired.
+        results = [future.result() for future in futures]
+        population = Population.concatenate([part for part, _ in results])
+        ticks = max(shard_ticks for _, shard_ticks in results)
+        return population, ticks
+
+    def close(self):
+        self.pool.shutdown()
\ No newline at end of file
@@ -1,13 +1,16 @@
 import random
 import torch
-import torch.nn as nn
 
 from source.variables import *
 from source.model.player import Player
+from source.model.genome import GENOME_SIZE, brain_module, genome_forward, random_genomes
+from source.model.platform_index import closest_above, platforms_around
 
 class AIPlayer(Player):
 
-    def __init__(self):
+    # with a generator the starting weights are drawn from it instead of torch's global random state.
+    # with a genome the bot uses that row of weights (usually a row of its generation's genome matrix) instead.
+    def __init__(self, generator=None, genome=None):
         super().__init__()
 
         self.fitness = 0
@@ -17,19 +20,23 @@ class AIPlayer(Player):
         self.firstJump = True
         self.color = None
 
-        # neural network
-        self.brain = nn.Sequential(
-            nn.Linear(8, 16),
-            nn.ReLU(),
-            nn.Linear(16, 16),
-            nn.ReLU(),
-            nn.Linear(16, 3)
-        )
+        # neural network, all its weights and biases are one flat row, see genome.py
+        if genome is None:
+            genome = random_genomes(1, generator)[0]
+        self.genome = genome
+        self._brain = None
+
+    # the nn.Sequential of the genome, only built when something asks for it.
+    # its parameters are views of the genome, so changing one changes the other.
+    @property
+    def brain(self):
+        if self._brain is None:
+            self._brain = brain_module(self.genome)
+        return self._brain
 
     def set_color(self, color):
         self.color = color
-        self.surf1.fill(color)
-        self.surf2.fill(color)
+        self.set_colors(color, color)
 
     def get_color(self):
         return self.color
@@ -38,18 +45,12 @@ class AIPlayer(Player):
     def get_state(self, platforms):
 
         # getting the next platform to jump to
-        next_plat = None
-        min_dist = float('inf')
-        for plat in platforms:
-            # reminder that the y pos decreases as you go up in pygame in all cases.
-            # so we are looking for the closest platform above the bot even though we are checking for
-            # plat.rect.top < self.pos.y the plat rect top is at a greater height than self.pos.y.
-            if plat.rect.top < self.pos.y:
-                dist = self.pos.y - plat.rect.top
-                if dist < min_dist:
-                    min_dist = dist
-                    next_plat = plat
-                    self.nextPlat = next_plat
+        # reminder that the y pos decreases as you go up in pygame in all cases.
+        # so we are looking for the closest platform above the bot even though we are checking for
+        # plat.rect.top < self.pos.y the plat rect top is at a greater height than self.pos.y.
+        next_plat = closest_above(platforms, self.pos.y)
+        if next_plat:
+            self.nextPlat = next_plat
 
         # in case no platforms are found (reached the top), set the position to the bot's position.
         next_plat_x = self.pos.x
@@ -77,12 +78,17 @@ class AIPlayer(Player):
 
         return state
 
-    def decide_action(self, platforms):
+    def decide_action(self, platforms, rng=random):
 
         # getting the input state for the brain
         state = self.get_state(platforms)
+        return self.act(state, rng)
+
+    # the brain's half of deciding, kept apart from get_state so the population can hand in states it built itself.
+    # the exploration noise comes from rng, the global random module unless another stream is given
+    def act(self, state, rng=random):
         # getting the output from the brain using the state as input
-        output = self.brain(state)
+        output = genome_forward(self.genome, state)
 
         # normalizing the outputs
         move_x = torch.tanh(output[0])
@@ -91,9 +97,9 @@ class AIPlayer(Player):
 
         # this is to promote exploration
         exploration_scale = 0.1
-        move_x += random.uniform(-exploration_scale, exploration_scale)
-        jump_dir += random.uniform(-exploration_scale, exploration_scale)
-        jump_strength += random.uniform(-exploration_scale, exploration_scale)
+        move_x += rng.uniform(-exploration_scale, exploration_scale)
+        jump_dir += rng.uniform(-exploration_scale, exploration_scale)
+        jump_strength += rng.uniform(-exploration_scale, exploration_scale)
 
         # fixing after exploration scaling
         move_x = max(-1, min(1, move_x))
@@ -178,7 +184,7 @@ class AIPlayer(Player):
     def check_vertical_collision(self, platforms):
         self.control = False
 
-        for plat in platforms:
+        for plat in platforms_around(platforms, self.rect):
             if self.rect.colliderect(plat.rect):
 
                 # Falling down onto a platform, the condition after and is to eliminate the edge case of top corners of players
@@ -205,16 +211,17 @@ class AIPlayer(Player):
                     self.rect.midbottom = (self.pos.x, self.pos.y)
                     self.rect2.centery = self.rect.centery
 
-    def mutate_weights(self, mutation_rate=0.01):
-        # we are not using any back propagation, so no need to track gradients
-        with torch.no_grad():
-            for param in self.brain.parameters():
-                # we have 6 params, the 3 weights and 3 biases
-                param += torch.randn_like(param) * mutation_rate
+    def mutate_weights(self, mutation_rate=0.01, generator=None):
+        # every weight and bias (the 3 weights and 3 biases) gets its noise in one go
+        self.genome += torch.randn(GENOME_SIZE, generator=generator) * mutation_rate
+
+    # the same starting weights nn.Linear gives itself, uniform in +-1/sqrt(inputs), but drawn from the generator
+    def reset_weights(self, generator=None):
+        self.genome.copy_(random_genomes(1, generator)[0])
 
     def copy_weights_from(self, parent):
         # puts the copy of weights from the parent bot to the child bot. 
-        self.brain.load_state_dict(parent.brain.state_dict())
+        self.genome.copy_(parent.genome)
 
     def inspect_weights(self):
         # this function inspects the first layer's weights,
@@ -0,0 +1,89 @@
+import random
+import hashlib
+import numpy as np
+import torch
+
+from source.model.genome import layer_views
+from source.model.rng import bot_keys, keyed_uniform
+
+# same exploration as AIPlayer.act
+EXPLORATION_SCALE = 0.1
+
+# the lowest and highest value of (move_x, jump_dir, jump_strength) after exploration
+ACTION_MIN = torch.tensor([-1.0, -1.0, 0.0])
+ACTION_MAX = torch.tensor([1.0, 1.0, 1.0])
+
+
+# the genomes of the players as one [pop, GENOME_SIZE] matrix, see genome.py
+def genome_matrix(players):
+    return torch.stack([p.genome for p in players])
+
+
+# a 64 bit hash of every row of a genome matrix, two brains with exactly the same weights get the same digest
+def genome_digests(genomes):
+    rows = np.ascontiguousarray(np.asarray(genomes, dtype=np.float32))
+    return np.array([int.from_bytes(hashlib.blake2b(row.tobytes(), digest_size=8).digest(), "little")
+                     for row in rows], dtype=np.uint64)
+
+
+# All the brains of a population stacked together, the weights of layer k are one [pop, in, out] tensor.
+# Instead of one forward pass per bot, every tick does one batched matmul per layer for all grounded bots.
+# An instance is a policy for Population.step.
+class BatchedBrain:
+
+    def __init__(self, genomes, noise_keys=None, exploration_scale=EXPLORATION_SCALE):
+        genomes = torch.as_tensor(genomes, dtype=torch.float32)
+        pop = genomes.shape[0]
+        self.exploration_scale = exploration_scale
+
+        # cutting the rows back into layers, nn.Linear keeps its weight as [out, in] so it is transposed here
+        # so x @ w works for a batch of row vectors
+        self.weights = []
+        self.biases = []
+        for weight, bias in layer_views(genomes):
+            self.weights.append(weight.transpose(1, 2).contiguous())
+            self.biases.append(bias.unsqueeze(1).contiguous())
+
+        # the exploration noise of every bot comes from its own key and how many decisions it already made,
+        # so a bot explores the same way whether it is simulated alone, in a batch or in another process
+        if noise_keys is None:
+            noise_keys = bot_keys(random.getrandbits(64), pop)
+        self.noise_keys = np.asarray(noise_keys, dtype=np.uint64)
+        self.decisions = np.zeros(pop, dtype=np.uint64)
+
+    @classmethod
+    def from_players(cls, players, **kwargs):
+        return cls(genome_matrix(players), **kwargs)
+
+    # raw outputs of the brains of the bots in idx for their states, shape [len(idx), 3]
+    def forward(self, idx, states):
+        rows = torch.from_numpy(np.asarray(idx, dtype=np.int64))
+        x = torch.from_numpy(np.asarray(states)).to(torch.float32).unsqueeze(1)
+        with torch.no_grad():
+            last = len(self.weights) - 1
+            for k, (w, b) in enumerate(zip(self.weights, self.biases)):
+                x = torch.baddbmm(b[rows], x, w[rows])
+                # ReLU between the layers, not after the last one, the same as the nn.Sequential
+                if k < last:
+                    x = torch.relu(x)
+        return x.squeeze(1)
+
+    # the policy, the same normalizing and exploration as AIPlayer.act but for the whole batch at once
+    def __call__(self, idx, states):
+        output = self.forward(idx, states)
+
+        actions = torch.empty_like(output)
+        actions[:, 0] = torch.tanh(output[:, 0])
+        actions[:, 1] = torch.tanh(output[:, 1])
+        actions[:, 2] = torch.sigmoid(output[:, 2])
+
+        # this is to promote exploration
+        if self.exploration_scale > 0:
+            uniform = keyed_uniform(self.noise_keys[idx], self.decisions[idx], actions.shape[1])
+            noise = (2 * uniform - 1) * self.exploration_scale
+            actions += torch.from_numpy(noise).to(torch.float32)
+        self.decisions[idx] += np.uint64(1)
+
+        # fixing after exploration scaling
+        actions = torch.clamp(actions, ACTION_MIN, ACTION_MAX)
+        return actions.to(torch.float64).numpy()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import math
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# sizes of the layers of the brain, 8 inputs, two hidden layers of 16 and 3 outputs
+LAYER_SIZES = (8, 16, 16, 3)
+
+# A genome is every weight and bias of one brain in one flat float32 row, in the same order as the parameters of
+# the nn.Sequential: W1, b1, W2, b2, W3, b3, with nn.Linear's [out, in] weight layout.
+# A whole generation is one [pop, GENOME_SIZE] matrix, so copying, mutating and crossing brains is one tensor
+# operation for everyone instead of a loop over modules.
+LAYERS = []
+GENOME_SIZE = 0
+for n_in, n_out in zip(LAYER_SIZES, LAYER_SIZES[1:]):
+    # (offset of the weight, inputs, outputs), the bias comes right after the weight
+    LAYERS.append((GENOME_SIZE, n_in, n_out))
+    GENOME_SIZE += n_out * n_in + n_out
+
+# every gene starts uniform in +-1/sqrt(inputs of its layer), the same range nn.Linear uses
+INIT_BOUNDS = torch.cat([torch.full((n_out * n_in + n_out,), 1 / math.sqrt(n_in)) for _, n_in, n_out in LAYERS])
+
+
+# count new random genomes, from the generator or torch's global random state
+def random_genomes(count, generator=None):
+    return (torch.rand(count, GENOME_SIZE, generator=generator) * 2 - 1) * INIT_BOUNDS
+
+
+# the (weight, bias) views of every layer, weights are [..., out, in] and biases [..., out].
+# works for a single genome and for a matrix, writing to a view writes to the genome.
+def layer_views(genomes):
+    views = []
+    for offset, n_in, n_out in LAYERS:
+        end = offset + n_out * n_in
+        weight = genomes[..., offset:end].unflatten(-1, (n_out, n_in))
+        bias = genomes[..., end:end + n_out]
+        views.append((weight, bias))
+    return views
+
+
+# children[i] is a copy of parents[choices[i]] with gaussian noise of mutation_rate on every gene
+def breed(parents, choices, mutation_rate, generator=None):
+    children = parents[torch.as_tensor(choices, dtype=torch.long)]
+    children += torch.randn(children.shape, generator=generator) * mutation_rate
+    return children
+
+
+# uniform crossover, every gene of a child comes from either of its two parents with the same chance
+def crossover(first, second, generator=None):
+    from_first = torch.rand(first.shape, generator=generator) < 0.5
+    return torch.where(from_first, first, second)
+
+
+# the forward pass of one brain straight from its genome, the same numbers as brain_module(genome)(x)
+# (nn.Linear is F.linear too) without building the module
+def genome_forward(genome, x):
+    views = layer_views(genome)
+    for k, (weight, bias) in enumerate(views):
+        x = F.linear(x, weight, bias)
+        if k < len(views) - 1:
+            x = torch.relu(x)
+    return x
+
+
+# the nn.Sequential of a genome, its parameters are views of the row so the module and the genome never go out of sync
+def brain_module(genome):
+    layers = []
+    for k, (weight, bias) in enumerate(layer_views(genome)):
+        linear = nn.Linear(weight.shape[1], weight.shape[0], device="meta")
+        linear.weight = nn.Parameter(weight, requires_grad=False)
+        linear.bias = nn.Parameter(bias, requires_grad=False)
+        layers.append(linear)
+        if k < len(LAYERS) - 1:
+            layers.append(nn.ReLU())
+    return nn.Sequential(*layers)
\ No newline at end of file
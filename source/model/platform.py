@@ -1,15 +1,31 @@
 import pygame
 import random
 from source.variables import WIDTH, HEIGHT
+from source.model.platform_index import PlatformIndex
+from source.assets import display_surface
 
 class Platform(pygame.sprite.Sprite):
     
     def __init__(self, pos, width=100, height=12):
         super().__init__()
-        self.surf = pygame.Surface((width, height))
-        self.surf.fill((255, 255, 0))
-        self.rect = self.surf.get_rect(center=pos)
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.rect.center = pos
         self.num = 0
+        # like the players, the surface is only made once the platform is drawn
+        self.color = (255, 255, 0)
+        self._surf = None
+
+    @property
+    def surf(self):
+        if self._surf is None:
+            self._surf = display_surface(pygame.Surface(self.rect.size))
+            self._surf.fill(self.color)
+        return self._surf
+
+    def set_color(self, color):
+        self.color = color
+        if self._surf is not None:
+            self._surf.fill(color)
 
     '''
     Could be a possible addition in future.
@@ -17,7 +33,8 @@ class Platform(pygame.sprite.Sprite):
         pass
     '''
 
-    def generate_platforms(count):
+    # rng is where the random gaps come from, the global random module unless a seeded random.Random is given
+    def generate_platforms(count, rng=random):
 
         # Each platform has a number
         platNum = 0
@@ -26,7 +43,7 @@ class Platform(pygame.sprite.Sprite):
 
         # Manually creating the first platform, which acts as the ground.
         first_platform = Platform((WIDTH / 2, HEIGHT), width=WIDTH, height=160)
-        first_platform.surf.fill((255, 0, 0))
+        first_platform.set_color((255, 0, 0))
         first_platform.num = platNum
         platNum += 1
         platforms.append(first_platform)
@@ -40,8 +57,8 @@ class Platform(pygame.sprite.Sprite):
         MAXIMUM_Y_GAP = 200
         
         # Randomly generate a new platform.
-        yGap = random.randint(MINIMUM_Y_GAP, MAXIMUM_Y_GAP) - 100
-        currPlatform = Platform((random.randint(50, WIDTH - 50), first_platform.rect.centery - (yGap + first_platform.rect.height)))
+        yGap = rng.randint(MINIMUM_Y_GAP, MAXIMUM_Y_GAP) - 100
+        currPlatform = Platform((rng.randint(50, WIDTH - 50), first_platform.rect.centery - (yGap + first_platform.rect.height)))
         currPlatform.num = platNum
         platforms.append(currPlatform)
 
@@ -49,8 +66,8 @@ class Platform(pygame.sprite.Sprite):
         # This is to ensure that the game remains possible and random.
         for i in range(count - 1):
             platNum = i + 2
-            xGap = random.choice([-1,1]) * random.randint(MINIMUM_X_GAP, MAXIMUM_X_GAP)
-            yGap = random.randint(MINIMUM_Y_GAP, MAXIMUM_Y_GAP)
+            xGap = rng.choice([-1,1]) * rng.randint(MINIMUM_X_GAP, MAXIMUM_X_GAP)
+            yGap = rng.randint(MINIMUM_Y_GAP, MAXIMUM_Y_GAP)
             # This condition checks if the platform would go offscreen, and if so, it flips the xGap to the opposite direction.
             if (currPlatform.rect.centerx + xGap <= 50) or (currPlatform.rect.centerx + xGap >= WIDTH - 50):
                 xGap *= -1
@@ -64,6 +81,7 @@ class Platform(pygame.sprite.Sprite):
 
         # coloring the last platform purple
         if len(platforms) > 1:
-            platforms[-1].surf.fill((157, 0, 255))
+            platforms[-1].set_color((157, 0, 255))
 
-        return platforms
\ No newline at end of file
+        # the course is generated in ascending height, the index keeps it sorted by height for fast lookups
+        return PlatformIndex(platforms)
\ No newline at end of file
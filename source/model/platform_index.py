@@ -0,0 +1,74 @@
+import bisect
+from collections.abc import Sequence
+
+
+# The platforms of a course sorted by height, so finding the next platform or the platforms a player could be
+# touching is a binary search instead of a loop over the whole course.
+# It still behaves like the list it was made from, iterating and indexing go in course order.
+class PlatformIndex(Sequence):
+
+    def __init__(self, platforms):
+        self.platforms = list(platforms)
+
+        # sorted by rect.top, python's sort is stable so equal tops stay in course order
+        self.order = sorted(range(len(self.platforms)), key=lambda i: self.platforms[i].rect.top)
+        self.tops = [self.platforms[i].rect.top for i in self.order]
+        # the ground is much taller than the other platforms, we need it to know how far a bottom can be from its top
+        self.max_height = max((p.rect.height for p in self.platforms), default=0)
+
+    def __len__(self):
+        return len(self.platforms)
+
+    def __getitem__(self, i):
+        return self.platforms[i]
+
+    def __iter__(self):
+        return iter(self.platforms)
+
+    # the closest platform above y (smallest distance with top < y), None if there is nothing above anymore.
+    # on equal tops the first one in course order wins, the same one the loop in get_state used to keep.
+    def above(self, y):
+        k = bisect.bisect_left(self.tops, y)
+        if k == 0:
+            return None
+        first = bisect.bisect_left(self.tops, self.tops[k - 1])
+        return self.platforms[self.order[first]]
+
+    # the platforms whose vertical span overlaps [top, bottom), in course order so collisions are
+    # still resolved in the same order as looping over the whole list
+    def overlapping(self, top, bottom):
+        lo = bisect.bisect_right(self.tops, top - self.max_height)
+        hi = bisect.bisect_left(self.tops, bottom)
+        hits = sorted(i for i in self.order[lo:hi] if self.platforms[i].rect.bottom > top)
+        return [self.platforms[i] for i in hits]
+
+
+# The model classes call these, so they work with an index and with a plain list of platforms (like in the tests),
+# a list just gets scanned whole like before.
+def platforms_between(platforms, top, bottom):
+    if isinstance(platforms, PlatformIndex):
+        return platforms.overlapping(top, bottom)
+    return platforms
+
+
+# the platforms a rect could touch while it is pushed out of platforms, landing or bumping moves it by
+# less than its own height plus the height of the platform it hit, so the band is padded by that
+def platforms_around(platforms, rect):
+    if isinstance(platforms, PlatformIndex):
+        pad = rect.height + platforms.max_height
+        return platforms.overlapping(rect.top - pad, rect.bottom + pad)
+    return platforms
+
+
+# the closest platform above y, see PlatformIndex.above
+def closest_above(platforms, y):
+    if isinstance(platforms, PlatformIndex):
+        return platforms.above(y)
+
+    next_plat = None
+    min_dist = float('inf')
+    for plat in platforms:
+        if plat.rect.top < y and y - plat.rect.top < min_dist:
+            min_dist = y - plat.rect.top
+            next_plat = plat
+    return next_plat
\ No newline at end of file
@@ -1,20 +1,24 @@
 import pygame
 from pygame.locals import *
 from source.variables import *
+from source.model.platform_index import platforms_between, platforms_around
+from source.assets import display_surface
 
 class Player(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
 
         # Yellow vertical collision detection
-        self.surf1 = pygame.Surface((24, 30))
-        self.surf1.fill((255, 255, 0))
-        self.rect = self.surf1.get_rect()
+        self.rect = pygame.Rect(0, 0, 24, 30)
+        self.color1 = (255, 255, 0)
 
         # Purple horizontal collision detection.
-        self.surf2 = pygame.Surface((30, 24))
-        self.surf2.fill((255, 0, 255))
-        self.rect2 = self.surf2.get_rect()
+        self.rect2 = pygame.Rect(0, 0, 30, 24)
+        self.color2 = (255, 0, 255)
+
+        # the surfaces are only made once something draws the player, a simulated bot never needs them
+        self._surf1 = None
+        self._surf2 = None
 
         self.pos = vec(WIDTH / 2, HEIGHT - 12)
         self.vel = vec(0, 0)
@@ -36,6 +40,29 @@ class Player(pygame.sprite.Sprite):
         self.reached = 0
         self.highestReached = 0
 
+    @property
+    def surf1(self):
+        if self._surf1 is None:
+            self._surf1 = display_surface(pygame.Surface(self.rect.size))
+            self._surf1.fill(self.color1)
+        return self._surf1
+
+    @property
+    def surf2(self):
+        if self._surf2 is None:
+            self._surf2 = display_surface(pygame.Surface(self.rect2.size))
+            self._surf2.fill(self.color2)
+        return self._surf2
+
+    # changing the colors also repaints the surfaces, if they were made already
+    def set_colors(self, color1, color2):
+        self.color1 = color1
+        self.color2 = color2
+        if self._surf1 is not None:
+            self._surf1.fill(color1)
+        if self._surf2 is not None:
+            self._surf2.fill(color2)
+
     def move(self, platforms):
         # Gravity
         self.acc = vec(0, 0.5)
@@ -80,7 +107,8 @@ class Player(pygame.sprite.Sprite):
 
 
     def check_horizontal_collision(self, platforms):
-        for plat in platforms:
+        # the purple rect only moves sideways here, so only platforms at its height can be hit
+        for plat in platforms_between(platforms, self.rect2.top, self.rect2.bottom):
             if self.rect2.colliderect(plat.rect):
                 # Moving right
                 if self.vel.x > 0:  
@@ -94,7 +122,7 @@ class Player(pygame.sprite.Sprite):
 
     def check_vertical_collision(self, platforms):
         grounded = False
-        for plat in platforms:
+        for plat in platforms_around(platforms, self.rect):
             if self.rect.colliderect(plat.rect):
                 # Falling down onto a platform, the second condition is to eliminate the edge case of top corners of players
                 # Clipping the bottom of a platform when they are diagonally falling down.
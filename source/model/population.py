@@ -0,0 +1,360 @@
+import numpy as np
+import torch
+
+from source.variables import *
+from source.profiler import profiler
+
+# These have to match the sizes and speeds Player uses, the population is the same physics just done for
+# every bot at once with numpy arrays instead of one AIPlayer.move call per bot.
+BODY_WIDTH, BODY_HEIGHT = 24, 30
+SIDE_WIDTH, SIDE_HEIGHT = 30, 24
+GRAVITY = 0.5
+HORIZ_SPEED = 5
+MAX_FALL_SPEED = 10
+
+
+# pygame rounds floats half away from zero when they are put into a Rect, we need the exact same integers
+# or the collisions would not match AIPlayer.move
+def pygame_round(values):
+    truncated = np.trunc(values)
+    halfway = np.abs(values - truncated) >= 0.5
+    return (truncated + np.where(halfway, np.sign(values), 0)).astype(np.int64)
+
+
+# the course as an array, one (left, top, right, bottom, num) row per platform in course order
+def course_bounds(platforms):
+    rows = [(p.rect.left, p.rect.top, p.rect.right, p.rect.bottom, p.num) for p in platforms]
+    return np.array(rows, dtype=np.int64).reshape(-1, 5)
+
+
+# the reference policy, every bot runs its own brain on its own state, one forward pass at a time
+def player_policy(players):
+    def policy(idx, states):
+        actions = np.empty((len(idx), 3))
+        for row, i in enumerate(idx):
+            actions[row] = players[i].act(torch.tensor(states[row], dtype=torch.float32))
+        return actions
+    return policy
+
+
+# The whole AI population stored as a struct of arrays, index i of every array is bot i.
+# step() moves every alive bot one tick and gives the same results as calling AIPlayer.move on each of them.
+# With stagnation limits, a bot that hasn't reached a new highest platform for progress_limit ticks or hasn't
+# moved at all for still_limit ticks is retired, it keeps its fitness but isn't moved anymore.
+# None or 0 turns a limit off, which is the default so the results stay the same as AIPlayer.move.
+class Population:
+
+    # every array that has one entry per bot
+    BOT_ARRAYS = ("pos_x", "pos_y", "vel_x", "vel_y", "control", "alive", "first_jump",
+                  "fitness", "highest_fitness", "reached", "highest_reached", "next_plat",
+                  "retired", "progress_ticks", "still_ticks")
+
+    def __init__(self, size, bounds, progress_limit=None, still_limit=None):
+        self.size = size
+        self.progress_limit = progress_limit
+        self.still_limit = still_limit
+        self.bounds = np.asarray(bounds, dtype=np.int64).reshape(-1, 5)
+        self.plat_left = self.bounds[:, 0].copy()
+        self.plat_top = self.bounds[:, 1].copy()
+        self.plat_right = self.bounds[:, 2].copy()
+        self.plat_bottom = self.bounds[:, 3].copy()
+        self.plat_num = self.bounds[:, 4].copy()
+        self.plat_centerx = self.plat_left + (self.plat_right - self.plat_left) // 2
+        # plain python copy of the rows, it is much faster to loop over than numpy scalars
+        self.plat_rows = self.bounds.tolist()
+
+        # platform indices sorted by height, the same order PlatformIndex uses, so finding the next platform
+        # and the platforms in a band of heights is a binary search
+        self.height_order = np.argsort(self.plat_top, kind="stable")
+        self.sorted_tops = self.plat_top[self.height_order]
+        self.max_plat_height = int((self.plat_bottom - self.plat_top).max()) if len(self.bounds) > 0 else 0
+
+        # everyone starts in the middle of the first platform, the same as setupAI places them
+        start_y = self.plat_top[0] if len(self.bounds) > 0 else HEIGHT - 12
+        self.pos_x = np.full(size, WIDTH / 2)
+        self.pos_y = np.full(size, float(start_y))
+        self.vel_x = np.zeros(size)
+        self.vel_y = np.zeros(size)
+
+        self.control = np.ones(size, dtype=bool)
+        self.alive = np.ones(size, dtype=bool)
+        self.first_jump = np.ones(size, dtype=bool)
+
+        self.fitness = np.zeros(size)
+        self.highest_fitness = np.zeros(size)
+        self.reached = np.zeros(size, dtype=np.int64)
+        self.highest_reached = np.zeros(size, dtype=np.int64)
+        # index of the platform each bot is aiming for, -1 until it has looked for one
+        self.next_plat = np.full(size, -1, dtype=np.int64)
+
+        # stagnation, ticks since the last new highest platform and ticks without moving
+        self.retired = np.zeros(size, dtype=bool)
+        self.progress_ticks = np.zeros(size, dtype=np.int64)
+        self.still_ticks = np.zeros(size, dtype=np.int64)
+
+    # copying the state of existing AIPlayers, so a population can pick up wherever they are
+    @classmethod
+    def from_players(cls, players, bounds):
+        population = cls(len(players), bounds)
+        population.pos_x[:] = [p.pos.x for p in players]
+        population.pos_y[:] = [p.pos.y for p in players]
+        population.vel_x[:] = [p.vel.x for p in players]
+        population.vel_y[:] = [p.vel.y for p in players]
+        population.control[:] = [p.control for p in players]
+        population.alive[:] = [p.alive for p in players]
+        population.first_jump[:] = [p.firstJump for p in players]
+        population.fitness[:] = [p.fitness for p in players]
+        population.highest_fitness[:] = [p.highestFitness for p in players]
+        population.reached[:] = [p.reached for p in players]
+        population.highest_reached[:] = [p.highestReached for p in players]
+        return population
+
+    # joining populations that were simulated separately on the same course back into one, in the given order
+    @classmethod
+    def concatenate(cls, parts):
+        population = cls(sum(part.size for part in parts), parts[0].bounds,
+                         parts[0].progress_limit, parts[0].still_limit)
+        for name in cls.BOT_ARRAYS:
+            setattr(population, name, np.concatenate([getattr(part, name) for part in parts]))
+        return population
+
+    # the values of the bots in idx, one tuple per bot in BOT_ARRAYS order
+    def rows(self, idx):
+        columns = [getattr(self, name)[idx].tolist() for name in self.BOT_ARRAYS]
+        return list(zip(*columns))
+
+    # the other way around, putting rows from rows() back at the bots in idx
+    def set_rows(self, idx, rows):
+        if len(rows) == 0:
+            return
+        for name, column in zip(self.BOT_ARRAYS, zip(*rows)):
+            getattr(self, name)[idx] = column
+
+    # writing the arrays back into the AIPlayers, needed before drawing them and at the end of a generation
+    def sync_players(self, players, platforms):
+        pos_x, pos_y = self.pos_x.tolist(), self.pos_y.tolist()
+        vel_x, vel_y = self.vel_x.tolist(), self.vel_y.tolist()
+        control, alive, first_jump = self.control.tolist(), self.alive.tolist(), self.first_jump.tolist()
+        fitness, highest_fitness = self.fitness.tolist(), self.highest_fitness.tolist()
+        reached, highest_reached = self.reached.tolist(), self.highest_reached.tolist()
+        next_plat = self.next_plat.tolist()
+
+        for i, p in enumerate(players):
+            p.pos.x, p.pos.y = pos_x[i], pos_y[i]
+            p.vel.x, p.vel.y = vel_x[i], vel_y[i]
+            p.rect.midbottom = (p.pos.x, p.pos.y)
+            p.rect2.centerx = p.pos.x
+            p.rect2.centery = p.rect.centery
+            p.control, p.alive, p.firstJump = control[i], alive[i], first_jump[i]
+            p.fitness, p.highestFitness = fitness[i], highest_fitness[i]
+            p.reached, p.highestReached = reached[i], highest_reached[i]
+            if next_plat[i] >= 0:
+                p.nextPlat = platforms[next_plat[i]]
+
+    # the inputs of the neural network for the bots in idx, the same 8 values as AIPlayer.get_state
+    def get_states(self, idx):
+        x = self.pos_x[idx]
+        y = self.pos_y[idx]
+
+        # in case no platforms are found (reached the top), the bot's own position is used
+        next_x, next_y, next_left, next_right = x.copy(), y.copy(), x.copy(), x.copy()
+
+        # closest platform above each bot is the largest top still smaller than y, reminder that y decreases
+        # as you go up. On equal tops the first one in course order wins, like PlatformIndex.above.
+        if len(self.bounds) > 0:
+            below_y = np.searchsorted(self.sorted_tops, y, side="left")
+            found = below_y > 0
+            first = np.searchsorted(self.sorted_tops, self.sorted_tops[below_y[found] - 1], side="left")
+            plats = self.height_order[first]
+            self.next_plat[idx[found]] = plats
+
+            next_x[found] = self.plat_centerx[plats]
+            next_y[found] = self.plat_top[plats]
+            next_left[found] = self.plat_left[plats]
+            next_right[found] = self.plat_right[plats]
+
+        return np.column_stack([x, y, next_x, next_y, self.vel_x[idx], self.vel_y[idx], next_left, next_right])
+
+    # indices of the platforms overlapping the heights [low, high), in course order like PlatformIndex.overlapping
+    def platforms_between(self, low, high):
+        lo = np.searchsorted(self.sorted_tops, low - self.max_plat_height, side="right")
+        hi = np.searchsorted(self.sorted_tops, high, side="left")
+        hits = self.height_order[lo:hi]
+        return np.sort(hits[self.plat_bottom[hits] > low]).tolist()
+
+    # if any bot is still being moved, a generation can end when this is False
+    def running(self):
+        return bool((self.alive & ~self.retired).any())
+
+    # moves every alive bot that isn't retired one tick, policy(idx, states) returns a (len(idx), 3) array of
+    # (move_x, jump_dir, jump_strength) for the bots that are on the ground.
+    def step(self, policy):
+        active = np.flatnonzero(self.alive & ~self.retired)
+        if len(active) == 0:
+            return
+
+        tracking = bool(self.progress_limit or self.still_limit)
+        if tracking:
+            x_before, y_before = self.pos_x[active], self.pos_y[active]
+            reached_before = self.highest_reached[active]
+
+        # only bots with control (on the ground) get to decide anything
+        deciding = active[self.control[active]]
+        if len(deciding) > 0:
+            with profiler.phase("get_state"):
+                states = self.get_states(deciding)
+            with profiler.phase("brain"):
+                actions = policy(deciding, states)
+            self.apply_actions(deciding, actions)
+
+        with profiler.phase("physics"):
+            self.move_horizontal(active)
+            self.move_vertical(active)
+
+        if tracking:
+            self.retire_stagnant(active, x_before, y_before, reached_before)
+
+    # counts how long the bots in idx went without progress or without moving and retires the ones over a limit.
+    # a bot sitting on a platform is caught by the still limit, one bouncing in place by the progress limit.
+    def retire_stagnant(self, idx, x_before, y_before, reached_before):
+        improved = self.highest_reached[idx] > reached_before
+        self.progress_ticks[idx] = np.where(improved, 0, self.progress_ticks[idx] + 1)
+        still = (self.pos_x[idx] == x_before) & (self.pos_y[idx] == y_before)
+        self.still_ticks[idx] = np.where(still, self.still_ticks[idx] + 1, 0)
+
+        stagnant = np.zeros(len(idx), dtype=bool)
+        if self.progress_limit:
+            stagnant |= self.progress_ticks[idx] >= self.progress_limit
+        if self.still_limit:
+            stagnant |= self.still_ticks[idx] >= self.still_limit
+        self.retired[idx[stagnant & self.alive[idx]]] = True
+
+    # the decision part of AIPlayer.move, for all deciding bots at once
+    def apply_actions(self, idx, actions):
+        actions = np.asarray(actions, dtype=np.float64)
+        move_x, jump_dir, jump_strength = actions[:, 0], actions[:, 1], actions[:, 2]
+
+        # setting the horizontal movement
+        walking = np.abs(move_x) > 0.2
+        self.vel_x[idx[walking]] = np.where(move_x[walking] < 0, -HORIZ_SPEED, HORIZ_SPEED)
+
+        # bots that want to jump
+        jumping = jump_strength > 0.5
+        jumpers = idx[jumping]
+        strength = jump_strength[jumping]
+        direction = jump_dir[jumping]
+
+        # rewarding the first jump, then the jump penalty, with no negative fitness.
+        # float_power because numpy's ** is off by the last bit from python's for some values
+        self.fitness[jumpers[self.first_jump[jumpers]]] += 30
+        self.first_jump[jumpers] = False
+        self.fitness[jumpers] = np.maximum(0, self.fitness[jumpers] - np.float_power(strength, 3) * 5)
+
+        # the same reduced max jump height as AIPlayer.move
+        strength = np.where(strength > 0.9, 0.8, strength)
+        scaled_strength = 5 + (13 * (strength / 1.0))
+
+        self.vel_y[jumpers] = -scaled_strength
+        self.vel_x[jumpers] = np.where(direction < -0.2, -HORIZ_SPEED, np.where(direction > 0.2, HORIZ_SPEED, 0))
+        self.control[jumpers] = False
+
+    # horizontal movement, leaving the screen and check_horizontal_collision
+    def move_horizontal(self, idx):
+        x = self.pos_x[idx] + self.vel_x[idx]
+        vel_x = self.vel_x[idx]
+
+        # we remove the bot if it goes out of bounds, it still finishes this tick like in AIPlayer.move
+        out = (x > WIDTH) | (x < 0)
+        self.alive[idx[out]] = False
+
+        # the purple rect, its y still comes from where the yellow rect was at the end of last tick
+        side_left = pygame_round(x) - SIDE_WIDTH // 2
+        side_top = pygame_round(self.pos_y[idx]) - BODY_HEIGHT + BODY_HEIGHT // 2 - SIDE_HEIGHT // 2
+
+        # platforms are checked in course order, every bot sees them in the same order the loop in Player does.
+        # only the platforms in the band of heights the bots are in can be hit.
+        low, high = side_top.min(), side_top.max() + SIDE_HEIGHT
+        with profiler.phase("collision"):
+            for j in self.platforms_between(low, high):
+                left, top, right, bottom, _ = self.plat_rows[j]
+                hit = ((side_left < right) & (side_left + SIDE_WIDTH > left) &
+                       (side_top < bottom) & (side_top + SIDE_HEIGHT > top))
+                if not hit.any():
+                    continue
+                hit_vel = vel_x[hit]
+                x[hit] = np.where(hit_vel > 0, left - SIDE_WIDTH / 2,
+                                  np.where(hit_vel < 0, right + SIDE_WIDTH / 2, x[hit]))
+                side_left[hit] = pygame_round(x[hit]) - SIDE_WIDTH // 2
+                # Reverse horizontal momentum
+                vel_x[hit] = -hit_vel
+
+        self.pos_x[idx] = x
+        self.vel_x[idx] = vel_x
+
+    # gravity, the max fall speed and check_vertical_collision of AIPlayer
+    def move_vertical(self, idx):
+        vel_y = np.minimum(self.vel_y[idx] + GRAVITY, MAX_FALL_SPEED)
+        y = self.pos_y[idx] + (vel_y + 0.5 * GRAVITY)
+
+        # the yellow rect
+        body_left = pygame_round(self.pos_x[idx]) - BODY_WIDTH // 2
+        body_top = pygame_round(y) - BODY_HEIGHT
+
+        control = np.zeros(len(idx), dtype=bool)
+        fitness = self.fitness[idx]
+        highest_fitness = self.highest_fitness[idx]
+        reached = self.reached[idx]
+        highest_reached = self.highest_reached[idx]
+
+        # same band lookup as move_horizontal, but bots get moved here so the band is worked out again
+        # after every landing or bump, for the platforms that come later in course order
+        low, high = body_top.min(), body_top.max() + BODY_HEIGHT
+        candidates = self.platforms_between(low, high)
+        k = 0
+        with profiler.phase("collision"):
+            while k < len(candidates):
+                j = candidates[k]
+                k += 1
+                left, top, right, bottom, num = self.plat_rows[j]
+                hit = ((body_left < right) & (body_left + BODY_WIDTH > left) &
+                       (body_top < bottom) & (body_top + BODY_HEIGHT > top))
+                if not hit.any():
+                    continue
+
+                # Falling down onto a platform, same corner clipping condition as AIPlayer
+                land = hit & (vel_y > 0) & (top > body_top)
+                # moving upward into a platform
+                bump = hit & ~land & (vel_y < 0)
+                landed, bumped = land.any(), bump.any()
+
+                if landed:
+                    y[land] = top
+                    vel_y[land] = 0
+                    body_top[land] = top - BODY_HEIGHT
+                    # rewarding the bot for reaching a new high platform
+                    reached[land] = num
+                    higher = land & (reached > highest_reached)
+                    fitness[higher] += 100
+                    highest_reached[higher] = reached[higher]
+                    better = land & (fitness > highest_fitness)
+                    highest_fitness[better] = fitness[better]
+                    # since the bot truly landed, we give it control again
+                    control[land] = True
+
+                if bumped:
+                    y[bump] = bottom + BODY_HEIGHT
+                    vel_y[bump] = 0
+                    body_top[bump] = bottom
+
+                if landed or bumped:
+                    low, high = body_top.min(), body_top.max() + BODY_HEIGHT
+                    candidates = [c for c in self.platforms_between(low, high) if c > j]
+                    k = 0
+
+        self.pos_y[idx] = y
+        self.vel_y[idx] = vel_y
+        self.control[idx] = control
+        self.fitness[idx] = fitness
+        self.highest_fitness[idx] = highest_fitness
+        self.reached[idx] = reached
+        self.highest_reached[idx] = highest_reached
\ No newline at end of file
@@ -0,0 +1,83 @@
+import random
+import numpy as np
+import torch
+
+# splitmix64 constants
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+# seeds are taken as 64 bit, so a negative seed like -1 works too
+SEED_MASK = 2 ** 64 - 1
+
+
+# scrambles 64 bit integers, the finalizer of splitmix64. uint64 arrays wrap around on overflow which is what we want.
+def mix64(values):
+    with np.errstate(over="ignore"):
+        x = np.asarray(values, dtype=np.uint64) + GOLDEN_GAMMA
+        x = (x ^ (x >> np.uint64(30))) * MIX_1
+        x = (x ^ (x >> np.uint64(27))) * MIX_2
+        return x ^ (x >> np.uint64(31))
+
+
+# one random key per bot from a single seed
+def bot_keys(seed, count):
+    return mix64(np.uint64(seed) ^ mix64(np.arange(count, dtype=np.uint64)))
+
+
+# one key per genome digest on a course, identical brains on the same course get the same key and so explore
+# the same way, which is what lets the fitness cache reuse a result
+def genome_keys(course_seed, digests):
+    return mix64(np.uint64(course_seed) ^ mix64(digests))
+
+
+# Uniform numbers in [0, 1) with shape (len(keys), channels) that only depend on (key, counter, channel).
+# Unlike a normal random generator there is no state to share, so a bot gets the same numbers no matter
+# which batch or which process it is simulated in.
+def keyed_uniform(keys, counters, channels):
+    base = mix64(np.asarray(keys, dtype=np.uint64) ^ mix64(counters))
+    bits = mix64(base[:, None] + np.arange(channels, dtype=np.uint64)[None, :])
+    # the top 53 bits, exactly what fits in a float64
+    return (bits >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+
+# Every part of the simulation that needs random numbers gets its own stream, all made from one seed.
+# A run with the same seed is repeated exactly, and one part drawing a bit more (say one more color)
+# doesn't change what the others get, like the next course.
+class RandomStreams:
+
+    def __init__(self, seed=None):
+        # without a seed one is taken from the global random state, so seeding that still makes a run repeatable
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+
+        course_seed, breeding_seed, selection_seed, mutation_seed = \
+            np.random.SeedSequence(seed & SEED_MASK).generate_state(4, dtype=np.uint64).tolist()
+        # the seed of every generated course comes from here, the exploration noise is keyed on it too
+        self.course = random.Random(course_seed)
+        # choosing parents and colors in setupAI
+        self.breeding = random.Random(breeding_seed)
+        # tournament and roulette selection
+        self.selection = random.Random(selection_seed)
+        # first generation weights and mutation
+        self.mutation = torch.Generator().manual_seed(mutation_seed)
+
+    # the state of every stream as numpy arrays, so a checkpoint can carry on exactly where a run was
+    def get_state(self):
+        state = {"seed": np.array(str(self.seed))}
+        for name in ("course", "breeding", "selection"):
+            _, internal, gauss_next = getattr(self, name).getstate()
+            state[name] = np.array(internal, dtype=np.uint32)
+            state[name + "_gauss"] = np.array(np.nan if gauss_next is None else gauss_next)
+        state["mutation"] = self.mutation.get_state().numpy()
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        streams = cls(int(state["seed"]))
+        for name in ("course", "breeding", "selection"):
+            gauss_next = float(state[name + "_gauss"])
+            internal = tuple(int(v) for v in state[name])
+            getattr(streams, name).setstate((3, internal, None if np.isnan(gauss_next) else gauss_next))
+        streams.mutation.set_state(torch.from_numpy(np.array(state["mutation"], dtype=np.uint8)))
+        return streams
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import json
+import time
+from contextlib import nullcontext
+
+# phases that are timed, nested phases are counted in the phase around them too
+# (physics includes collision, evaluate includes everything a headless generation does, generation is all of it)
+PHASES = ("generation", "setup", "events", "evaluate", "get_state", "brain", "physics", "collision", "draw", "clock")
+
+# the most trace events kept, about 100 bytes each, a long run just stops adding events after this
+MAX_TRACE_EVENTS = 1_000_000
+
+
+class Phase:
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+# Times the phases of the simulation, the controller and the model classes wrap their work in
+#   with profiler.phase("physics"):
+# Turned off it hands out a context that does nothing, so the hooks can stay in the hot loops.
+# The time of every phase adds up per generation, and with trace on every single phase is kept as a
+# Chrome trace event so a slow run can be opened in chrome://tracing or Perfetto.
+class Profiler:
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, enabled=False, trace=False):
+        self.enabled = enabled or trace
+        self.trace = trace
+        self.origin = time.perf_counter()
+        self.totals = {}
+        self.counts = {}
+        # (name, start, end) in seconds, turned into trace events only when they are written
+        self.events = []
+        self.dropped_events = 0
+
+    def phase(self, name):
+        if not self.enabled:
+            return NO_PHASE
+        return Phase(self, name)
+
+    def record(self, name, start, end):
+        self.totals[name] = self.totals.get(name, 0.0) + (end - start)
+        self.counts[name] = self.counts.get(name, 0) + 1
+        if self.trace:
+            if len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append((name, start, end))
+            else:
+                self.dropped_events += 1
+
+    # the seconds and calls of every phase since the last call, then starts counting again for the next generation
+    def take_totals(self):
+        totals = {name: (self.totals[name], self.counts[name]) for name in self.totals}
+        self.totals = {}
+        self.counts = {}
+        return totals
+
+    def write_trace(self, path):
+        pid = os.getpid()
+        trace_events = [{"name": name, "cat": "simulation", "ph": "X", "pid": pid, "tid": 0,
+                         "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6}
+                        for name, start, end in self.events]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped_events": self.dropped_events}}, f)
+
+
+# a context that does nothing, what phase() hands out when profiling is off
+NO_PHASE = nullcontext()
+
+# the one profiler every module times its phases with, the controller turns it on for a run
+profiler = Profiler()
+
+
+# one line for the terminal, the phases sorted by how long they took
+def format_totals(totals):
+    parts = [f"{name}={seconds * 1000:.0f}ms" for name, (seconds, _) in
+             sorted(totals.items(), key=lambda item: item[1][0], reverse=True)]
+    return ", ".join(parts)
\ No newline at end of file
@@ -3,4 +3,19 @@ import pygame
 HEIGHT = 750
 WIDTH = 700
 FPS = 60
-vec = pygame.math.Vector2
\ No newline at end of file
+vec = pygame.math.Vector2
+
+# MAIN SETTINGS FOR SIMULATION
+# each generation gets 20 seconds of simulated time, counted in ticks so it doesn't depend on how fast we render
+TICK_LIMIT = 20 * FPS
+# POPULATION SIZE SHOULD BE MINIMUM OF WHATEVER TOURNAMENT SIZE IS, OR IT WILL NOT WORK
+POPULATION_SIZE = 100
+NUMBER_OF_GENERATIONS = 150
+# a bot is retired early when it hasn't reached a new highest platform for PROGRESS_LIMIT ticks,
+# or hasn't moved at all for STILL_LIMIT ticks. the generation ends once every bot is dead or retired. 0 turns a rule off
+PROGRESS_LIMIT = 5 * FPS
+STILL_LIMIT = 2 * FPS
+# pressing S in the AI simulation switches between real time, RENDER_EVERY ticks per drawn frame and turbo
+RENDER_EVERY = 4
+# how many genome results the fitness cache remembers, 0 turns it off
+FITNESS_CACHE_SIZE = 10000
\ No newline at end of file
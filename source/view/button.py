@@ -1,5 +1,8 @@
-import os
 import pygame
+from source.assets import load_sound, CLICK_SOUND_PATH, CLICK_VOLUME
+from source.view.text_cache import render_text
+
+SHADOW_OFFSET = 3
 
 class Button:
     def __init__(self, text, pos, screen, font, width=400, height=50,
@@ -16,15 +19,11 @@ class Button:
         self.text_color = text_color
         self.hover_text_color = hover_text_color
         self.button = pygame.Rect(self.pos[0], self.pos[1], self.width, self.height)
+        # everything draw touches, the button and its shadow
+        self.area = self.button.union(self.button.move(SHADOW_OFFSET, SHADOW_OFFSET))
 
-        # sound
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-        sound_path = os.path.join(base_dir, "assets", "sounds", "click.mp3")
-        if os.path.exists(sound_path):
-            self.click_sound = pygame.mixer.Sound(sound_path)
-            self.click_sound.set_volume(0.4)
-        else:
-            self.click_sound = None
+        # sound, loaded once and shared by every button, None if the file is missing
+        self.click_sound = load_sound(CLICK_SOUND_PATH, CLICK_VOLUME)
 
     def draw(self):
         # Draws the button on the screen, and if hovered, theres a slight color change to show that.
@@ -35,8 +34,7 @@ class Button:
         text_color = self.hover_text_color if is_hovered else self.text_color
 
         # This is for a slight shadow effect on the buttons
-        shadow_offset = 3
-        shadow_rect = self.button.move(shadow_offset, shadow_offset)
+        shadow_rect = self.button.move(SHADOW_OFFSET, SHADOW_OFFSET)
         pygame.draw.rect(self.screen, (30,30,30), shadow_rect, border_radius=4)
 
         # Button and border
@@ -45,7 +43,7 @@ class Button:
         pygame.draw.rect(self.screen, "black", self.button, 2, border_radius=4)
 
         # Text
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = render_text(self.font, self.text, text_color)
         text_rect = text_surface.get_rect(center=self.button.center)
         self.screen.blit(text_surface, text_rect)
 
@@ -0,0 +1,266 @@
+import math
+import numpy as np
+import pygame
+from source.view.font import load_font
+from source.view.text_cache import render_text
+
+TITLE_SIZE = 18
+LABEL_SIZE = 16
+TICK_SIZE = 14
+
+
+# A long series is cut into buckets and only the lowest and highest point of every bucket are kept, in the order
+# they came in. A few thousand generations drawn into a few hundred pixels end up as about two points per pixel,
+# and no spike goes missing like it would by just skipping points.
+# Returns the positions in the series that were kept and their values.
+def decimate(values, buckets):
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= 2 * buckets:
+        return np.arange(len(values)), values
+
+    edges = np.linspace(0, len(values), buckets + 1).astype(np.int64)
+    kept = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = values[start:end]
+        lowest = start + int(np.argmin(bucket))
+        highest = start + int(np.argmax(bucket))
+        kept.extend(sorted({lowest, highest}))
+    kept = np.array(kept, dtype=np.int64)
+    return kept, values[kept]
+
+
+# about count evenly spaced round numbers (steps of 1, 2 or 5 times a power of ten) between lo and hi.
+# integer ticks never step by less than 1, a generation 1.5 doesn't exist
+def nice_ticks(lo, hi, count=6, integer=False):
+    if hi <= lo:
+        return [lo]
+    raw_step = (hi - lo) / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step)
+    if integer:
+        step = max(1, round(step))
+
+    # a little slack and rounding, -0.3 / 0.1 is -2.9999999999999996 and 3 * 0.1 is 0.30000000000000004
+    first = math.ceil(lo / step - 1e-9)
+    last = math.floor(hi / step + 1e-9)
+    return [round(k * step, 12) for k in range(first, last + 1)]
+
+
+def tick_label(value, step):
+    if step >= 1:
+        return f"{value:.0f}"
+    decimals = max(0, -math.floor(math.log10(step)))
+    return f"{value:.{decimals}f}"
+
+
+# draws a polyline with gaps, the dashes carry on over the corners so the pattern stays even
+def draw_dashed_lines(surface, color, points, width, dash=10, gap=6):
+    period = dash + gap
+    travelled = 0.0
+    for (x1, y1), (x2, y2) in zip(points[:-1], points[1:]):
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length == 0:
+            continue
+        along = 0.0
+        while along < length:
+            phase = (travelled + along) % period
+            if phase < dash:
+                end = min(length, along + dash - phase)
+                start_point = (x1 + (x2 - x1) * along / length, y1 + (y2 - y1) * along / length)
+                end_point = (x1 + (x2 - x1) * end / length, y1 + (y2 - y1) * end / length)
+                pygame.draw.line(surface, color, start_point, end_point, width)
+                along = end
+            else:
+                along += period - phase
+        travelled += length
+
+
+# A line chart drawn straight onto a pygame surface of the size it is shown at, in the game font.
+# Every series is (label, values, color, dashed), value i is drawn at x = x_start + i.
+class LineChart:
+
+    def __init__(self, width, height, font_path, title=None, x_label=None, y_label=None, integer_x=True,
+                 background=(255, 255, 255), foreground=(0, 0, 0)):
+        self.width = width
+        self.height = height
+        self.title = title
+        self.x_label = x_label
+        self.y_label = y_label
+        self.integer_x = integer_x
+        self.background = background
+        self.foreground = foreground
+        self.title_font = load_font(font_path, TITLE_SIZE)
+        self.label_font = load_font(font_path, LABEL_SIZE)
+        self.tick_font = load_font(font_path, TICK_SIZE)
+
+    def render(self, series, x_start=1):
+        surface = pygame.Surface((self.width, self.height))
+        surface.fill(self.background)
+
+        values = [np.asarray(vals, dtype=np.float64) for _, vals, _, _ in series]
+        count = max((len(v) for v in values), default=0)
+        x_lo, x_hi = x_start, x_start + max(count - 1, 1)
+        non_empty = [v for v in values if len(v) > 0]
+        y_lo = min((float(v.min()) for v in non_empty), default=0.0)
+        y_hi = max((float(v.max()) for v in non_empty), default=1.0)
+        if y_hi == y_lo:
+            y_lo, y_hi = y_lo - 1, y_hi + 1
+        # a bit of room above and below so the lines don't run along the frame
+        pad = (y_hi - y_lo) * 0.05
+        y_lo, y_hi = y_lo - pad, y_hi + pad
+
+        x_ticks = nice_ticks(x_lo, x_hi, 8, integer=self.integer_x)
+        y_ticks = nice_ticks(y_lo, y_hi, 6)
+        x_step = x_ticks[1] - x_ticks[0] if len(x_ticks) > 1 else 1
+        y_step = y_ticks[1] - y_ticks[0] if len(y_ticks) > 1 else 1
+        y_tick_surfs = [render_text(self.tick_font, tick_label(t, y_step), self.foreground) for t in y_ticks]
+
+        # the plot area is what is left once the title, labels and tick labels have their space
+        top = 10
+        if self.title:
+            title_surf = render_text(self.title_font, self.title, self.foreground)
+            surface.blit(title_surf, title_surf.get_rect(midtop=(self.width // 2, top)))
+            top += title_surf.get_height() + 10
+        left = 10 + max((s.get_width() for s in y_tick_surfs), default=0) + 8
+        if self.y_label:
+            y_label_surf = pygame.transform.rotate(render_text(self.label_font, self.y_label, self.foreground), 90)
+            left += y_label_surf.get_width() + 6
+        bottom = self.height - 10 - self.tick_font.get_height() - 8
+        if self.x_label:
+            x_label_surf = render_text(self.label_font, self.x_label, self.foreground)
+            bottom -= x_label_surf.get_height() + 4
+        right = self.width - 20
+        plot = pygame.Rect(left, top, max(right - left, 1), max(bottom - top, 1))
+
+        def to_x(x):
+            return plot.left + (x - x_lo) / (x_hi - x_lo) * plot.width
+
+        def to_y(y):
+            return plot.bottom - (y - y_lo) / (y_hi - y_lo) * plot.height
+
+        # ticks and their labels
+        for t, surf in zip(y_ticks, y_tick_surfs):
+            y = to_y(t)
+            pygame.draw.line(surface, self.foreground, (plot.left - 4, y), (plot.left, y))
+            surface.blit(surf, surf.get_rect(midright=(plot.left - 6, y)))
+        for t in x_ticks:
+            x = to_x(t)
+            pygame.draw.line(surface, self.foreground, (x, plot.bottom), (x, plot.bottom + 4))
+            surf = render_text(self.tick_font, tick_label(t, x_step), self.foreground)
+            surface.blit(surf, surf.get_rect(midtop=(x, plot.bottom + 6)))
+
+        if self.y_label:
+            surface.blit(y_label_surf, y_label_surf.get_rect(midleft=(10, plot.centery)))
+        if self.x_label:
+            surface.blit(x_label_surf, x_label_surf.get_rect(midbottom=(plot.centerx, self.height - 8)))
+
+        # the lines, at most about two points per pixel of width
+        for (label, _, color, dashed), vals in zip(series, values):
+            if len(vals) == 0:
+                continue
+            xs, ys = decimate(vals, plot.width)
+            points = [(to_x(x_start + x), to_y(y)) for x, y in zip(xs.tolist(), ys.tolist())]
+            if len(points) == 1:
+                pygame.draw.circle(surface, color, points[0], 2)
+            elif dashed:
+                draw_dashed_lines(surface, color, points, 2)
+            else:
+                pygame.draw.lines(surface, color, False, points, 2)
+
+        pygame.draw.rect(surface, self.foreground, plot, 1)
+        self.draw_legend(surface, series, plot)
+        return surface
+
+    def draw_legend(self, surface, series, plot):
+        labels = [render_text(self.tick_font, label, self.foreground) for label, _, _, _ in series]
+        if not labels:
+            return
+        sample = 30
+        line_height = max(s.get_height() for s in labels) + 4
+        box = pygame.Rect(plot.left + 8, plot.top + 8,
+                          sample + 18 + max(s.get_width() for s in labels), line_height * len(labels) + 8)
+        pygame.draw.rect(surface, self.background, box)
+        pygame.draw.rect(surface, self.foreground, box, 1)
+        for i, ((_, _, color, dashed), surf) in enumerate(zip(series, labels)):
+            y = box.top + 4 + i * line_height + line_height // 2
+            start, end = (box.left + 6, y), (box.left + 6 + sample, y)
+            if dashed:
+                draw_dashed_lines(surface, color, [start, end], 2, dash=8, gap=4)
+            else:
+                pygame.draw.line(surface, color, start, end, 2)
+            surface.blit(surf, surf.get_rect(midleft=(end[0] + 6, y)))
+
+# generations the live chart has room for at first, it doubles whenever the run gets longer
+LIVE_CAPACITY = 32
+
+
+# The small chart of the best and average fitness in the HUD of the AI simulation.
+# The lines are drawn onto a kept surface one generation at a time, so a frame only blits it.
+# Only when a value falls outside the scale or the run outgrows the width is it drawn again from the history,
+# with more room each time, so that happens a handful of times in a whole run.
+class LiveChart:
+
+    def __init__(self, width=180, height=70, colors=((0, 200, 0), (80, 120, 255)),
+                 background=(0, 0, 0), border=(120, 120, 120)):
+        self.width = width
+        self.height = height
+        self.colors = colors
+        self.background = background
+        self.border = border
+        # one list of values per line
+        self.history = [[] for _ in colors]
+        self.capacity = LIVE_CAPACITY
+        self.y_lo = 0.0
+        self.y_hi = 1.0
+        self.redraws = 0
+        self.surface = pygame.Surface((width, height))
+        self.redraw()
+
+    def __len__(self):
+        return len(self.history[0])
+
+    # one value per line for the generation that just finished
+    def add(self, *values):
+        first = len(self) == 0
+        for series, value in zip(self.history, values):
+            series.append(float(value))
+
+        rescale = False
+        if first:
+            self.y_lo = min(values)
+            self.y_hi = max(values) if max(values) > self.y_lo else self.y_lo + 1
+            rescale = True
+        # 1.5 times the room needed, so the scale grows geometrically
+        if max(values) > self.y_hi:
+            self.y_hi = self.y_lo + (max(values) - self.y_lo) * 1.5
+            rescale = True
+        if min(values) < self.y_lo:
+            self.y_lo = self.y_hi - (self.y_hi - min(values)) * 1.5
+            rescale = True
+        while len(self) > self.capacity:
+            self.capacity *= 2
+            rescale = True
+
+        if rescale:
+            self.redraw()
+        else:
+            # only the piece of line from the last generation to this one
+            i = len(self) - 1
+            for series, color in zip(self.history, self.colors):
+                pygame.draw.line(self.surface, color, self.point(i - 1, series[-2]), self.point(i, series[-1]))
+
+    def point(self, i, value):
+        x = 1 + i * (self.width - 3) / max(self.capacity - 1, 1)
+        y = self.height - 2 - (value - self.y_lo) / (self.y_hi - self.y_lo) * (self.height - 3)
+        return (x, y)
+
+    def redraw(self):
+        self.redraws += 1
+        self.surface.fill(self.background)
+        pygame.draw.rect(self.surface, self.border, self.surface.get_rect(), 1)
+        for series, color in zip(self.history, self.colors):
+            if len(series) < 2:
+                continue
+            kept, values = decimate(series, self.width)
+            points = [self.point(i, v) for i, v in zip(kept.tolist(), values.tolist())]
+            pygame.draw.lines(self.surface, color, False, points)
\ No newline at end of file
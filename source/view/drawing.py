@@ -1,9 +1,14 @@
 import pygame
 from source.variables import WIDTH, HEIGHT
+from source.view.level import LevelSurface
+from source.view.text_cache import render_text
 
 # Drawing class to handle all the drawing of the game
 class Drawing:
 
+    # the pre-drawn course of the platforms being drawn, made again when a new course comes in
+    level = None
+
     def __init__(self):
         pass
 
@@ -29,6 +34,19 @@ class Drawing:
                     highest_position_bot_alive = ap
 
         return highest_bot, highest_bot_alive, highest_position_bot_alive
+
+    @staticmethod
+    def level_for(platforms):
+        if Drawing.level is None or Drawing.level.platforms is not platforms:
+            Drawing.level = LevelSurface(platforms)
+        return Drawing.level
+
+    # if a player is anywhere on the screen with the camera at camera_offset_y, both its rects count
+    @staticmethod
+    def player_visible(player, camera_offset_y):
+        top = int(camera_offset_y)
+        return (min(player.rect.top, player.rect2.top) < top + HEIGHT and
+                max(player.rect.bottom, player.rect2.bottom) > top)
     
     # drawing function for the single player mode
     @staticmethod
@@ -38,37 +56,26 @@ class Drawing:
         # the camera follows the player
         camera_offset_y = p1.pos.y - HEIGHT / 2
         screen.fill("black")
-
-        # looping and drawing the entities, everything adjusted by the camera offset, so we follow the player
-        for entity in all_sprites:
-                # the player
-                if entity in players:
-                    draw_rect1 = entity.rect.copy()
-                    draw_rect1.y -= int(camera_offset_y)
-                    
-                    draw_rect2 = entity.rect2.copy()
-                    draw_rect2.y -= int(camera_offset_y)
-                    
-                    screen.blit(entity.surf1, draw_rect1)
-                    screen.blit(entity.surf2, draw_rect2)
-                # platforms
-                elif entity in platforms:
-                    draw_rect = entity.rect.copy()
-                    draw_rect.y -= int(camera_offset_y)
-                    screen.blit(entity.surf, draw_rect)
-                '''
-                else:
-                    # Possibile additions in future
-                '''
+        offset = int(camera_offset_y)
+
+        # drawing the part of the pre-drawn course the camera sees then the players, everything adjusted by the
+        # camera offset, so we follow the player. the players come straight from their list and anything
+        # off screen is skipped.
+        Drawing.level_for(platforms).draw(screen, camera_offset_y)
+        for player in players:
+            if Drawing.player_visible(player, camera_offset_y):
+                screen.blit(player.surf1, (player.rect.x, player.rect.y - offset))
+                screen.blit(player.surf2, (player.rect2.x, player.rect2.y - offset))
         pygame.display.update()
 
-    # drawing function for the ai simulation mode
+    # drawing function for the ai simulation mode, speed is how many times faster than real time the simulation runs
+    # and chart is the LiveChart of the run so far, shown in the top right
     @staticmethod
-    def drawAI(ai_players, platforms, all_sprites, screen, genNum, font):
+    def drawAI(ai_players, platforms, all_sprites, screen, genNum, font, speed=None, chart=None):
         screen.fill("black")
 
         # Title
-        title_surf = font.render("AI Simulation", True, "white")
+        title_surf = render_text(font, "AI Simulation", "white")
         title_rect = title_surf.get_rect(center=(WIDTH // 2, 20))
         screen.blit(title_surf, title_rect)
 
@@ -78,43 +85,32 @@ class Drawing:
         # drawing some information about the current generation
         if highest_bot is not None:
             info_text = f"Gen Num {genNum + 1}, highest fitness this gen={highest_bot.highestFitness:.2f}"
-            info_surf = font.render(info_text, True, (255, 255, 255))
+            if speed is not None:
+                info_text += f", speed x{speed:.1f}"
+            info_surf = render_text(font, info_text, (255, 255, 255))
             # positioning text to top left of screen
             screen.blit(info_surf, (10, 40))
 
         # the camera follows the highest position bot that is alive currently.
         camera_offset_y = highest_position_bot_alive.pos.y - HEIGHT / 2
-        
-        # looping through the entities and drawing their rects, everything adjusted by the camera offset, 
-        # so we follow the highest bot alive
-        for entity in all_sprites:
-            # Alive AI Players
-            if entity in ai_players and entity.alive == True:
-                draw_rect1 = entity.rect.copy()
-                draw_rect1.y -= int(camera_offset_y)
-
-                draw_rect2 = entity.rect2.copy()
-                draw_rect2.y -= int(camera_offset_y)
-
-                screen.blit(entity.surf1, draw_rect1)
-                screen.blit(entity.surf2, draw_rect2)
-
-            # Platforms
-            elif entity in platforms:
-                if entity == highest_position_bot_alive.nextPlat:
-                    draw_rect = entity.rect.copy()
-                    draw_rect.y -= int(camera_offset_y)
-                    pygame.draw.rect(screen, (255, 255, 255), draw_rect)
-                else:
-                    draw_rect = entity.rect.copy()
-                    draw_rect.y -= int(camera_offset_y)
-                    screen.blit(entity.surf, draw_rect)
-            '''
-            # This could exist if more entities are added in the future
-            else:
-                draw_rect = entity.rect.copy()
-                draw_rect.y -= int(camera_offset_y)
-                displaysurface.blit(entity.surf, draw_rect)'
-            '''
+        offset = int(camera_offset_y)
+
+        # drawing the part of the pre-drawn course the camera sees, then the alive AI players on top, everything
+        # adjusted by the camera offset, so we follow the highest bot alive. the platform it is going for is
+        # drawn white over the course.
+        Drawing.level_for(platforms).draw(screen, camera_offset_y)
+        next_plat = highest_position_bot_alive.nextPlat
+        if next_plat is not None:
+            pygame.draw.rect(screen, (255, 255, 255), next_plat.rect.move(0, -offset))
+
+        for ap in ai_players:
+            if ap.alive and Drawing.player_visible(ap, camera_offset_y):
+                screen.blit(ap.surf1, (ap.rect.x, ap.rect.y - offset))
+                screen.blit(ap.surf2, (ap.rect2.x, ap.rect2.y - offset))
+
+        # the chart is drawn when a generation finishes, here it is only blitted
+        if chart is not None:
+            screen.blit(chart.surface, (WIDTH - chart.width - 10, 75))
+
         # actually udpates the display
         pygame.display.update()
\ No newline at end of file
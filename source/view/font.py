@@ -6,4 +6,15 @@ import pygame.font
 class GameFont(pygame.font.Font):
     def __init__(self, font_path, size):
         super().__init__(font_path, size)
-        self.path = font_path
\ No newline at end of file
+        self.path = font_path
+
+
+# every font that was loaded, by (path, size), so the views share one font object instead of loading the file again
+FONTS = {}
+
+
+def load_font(font_path, size):
+    key = (font_path, size)
+    if key not in FONTS:
+        FONTS[key] = GameFont(font_path, size)
+    return FONTS[key]
\ No newline at end of file
@@ -0,0 +1,59 @@
+import pygame
+from source.variables import WIDTH, HEIGHT
+from source.model.platform_index import PlatformIndex
+from source.assets import display_surface
+
+# how tall one pre-drawn piece of the course is, the camera always sees at most two of them
+CHUNK_HEIGHT = HEIGHT
+# chunks kept drawn at a time, a whole 50 platform course as one surface would be about 27MB
+MAX_CHUNKS = 8
+
+
+# The platforms never move once a course is generated, so instead of blitting every platform every frame
+# the course is drawn once into screen wide chunks of CHUNK_HEIGHT pixels, and a frame only blits the
+# part of the one or two chunks the camera can see.
+# Chunks are drawn the first time the camera gets to them, and the ones furthest from the camera are
+# dropped once there are more than MAX_CHUNKS. Black is transparent, so anything drawn before stays visible.
+class LevelSurface:
+
+    def __init__(self, platforms):
+        self.platforms = platforms
+        # chunk number -> surface, None for a chunk with no platforms in it
+        self.chunks = {}
+
+    # the chunk that starts at chunk * CHUNK_HEIGHT in course coordinates
+    def chunk(self, chunk):
+        if chunk not in self.chunks:
+            if len(self.chunks) >= MAX_CHUNKS:
+                furthest = max(self.chunks, key=lambda k: abs(k - chunk))
+                del self.chunks[furthest]
+            self.chunks[chunk] = self.render_chunk(chunk)
+        return self.chunks[chunk]
+
+    def render_chunk(self, chunk):
+        top = chunk * CHUNK_HEIGHT
+        bottom = top + CHUNK_HEIGHT
+        if isinstance(self.platforms, PlatformIndex):
+            platforms = self.platforms.overlapping(top, bottom)
+        else:
+            platforms = [plat for plat in self.platforms if plat.rect.top < bottom and plat.rect.bottom > top]
+        if not platforms:
+            return None
+
+        surf = display_surface(pygame.Surface((WIDTH, CHUNK_HEIGHT)))
+        surf.fill((0, 0, 0))
+        # in course order, so overlapping platforms cover each other like they did when drawn one by one
+        for plat in platforms:
+            surf.blit(plat.surf, (plat.rect.x, plat.rect.y - top))
+        surf.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return surf
+
+    # draws the part of the course the camera sees at camera_offset_y
+    def draw(self, screen, camera_offset_y):
+        offset = int(camera_offset_y)
+        first = offset // CHUNK_HEIGHT
+        last = (offset + HEIGHT - 1) // CHUNK_HEIGHT
+        for chunk in range(first, last + 1):
+            surf = self.chunk(chunk)
+            if surf is not None:
+                screen.blit(surf, (0, chunk * CHUNK_HEIGHT - offset))
\ No newline at end of file
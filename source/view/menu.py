@@ -1,16 +1,15 @@
 import pygame
 from source.view.button import Button
+from source.view.font import load_font
+from source.assets import SMALL_FONT_SIZE
+from source.view.text_cache import render_text
 import sys
 from abc import ABC
-from source.variables import FPS
-import matplotlib
-# this is to avoid a glitch with matplotlib and pygame affecting the screen
-matplotlib.use("Agg")
+from source.view.chart import LineChart
 
-import matplotlib.pyplot as plt
-import io
-import matplotlib.ticker as ticker
-import matplotlib.font_manager as fm
+# the most milliseconds a menu sleeps waiting for input, it also wakes up this often to look at the mouse
+# in case it left the window without an event
+MENU_WAKE_UP = 250
 
 
 # Abstract class for menus, contains some styling and button logic
@@ -43,47 +42,74 @@ class BaseMenu(ABC):
 
     def wait_for_mouse_release(self):
         while pygame.mouse.get_pressed()[0]:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-            pygame.time.delay(10)
+            # sleeps until something happens, releasing the button is an event too
+            event = pygame.event.wait(MENU_WAKE_UP)
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
 
     def draw_title_with_shadow(self):
         # Shadow
-        shadow_surf = self.font.render(self.title, True, "gray")
+        shadow_surf = render_text(self.font, self.title, "gray")
         shadow_rect = shadow_surf.get_rect(center=(self.width // 2 + 2, 52))
         self.screen.blit(shadow_surf, shadow_rect)
 
         # Main title
-        title_surf = self.font.render(self.title, True, "white")
+        title_surf = render_text(self.font, self.title, "white")
         title_rect = title_surf.get_rect(center=(self.width // 2, 50))
         self.screen.blit(title_surf, title_rect)
 
-    # Each menu has a loop which runs till the user clicks a button
+    # everything of the menu that isn't a button, subclasses add their text here
+    def draw_content(self):
+        self.draw_title_with_shadow()
+
+    def draw(self):
+        self.screen.fill("black")
+        self.draw_content()
+        for button in self.buttons:
+            button.draw()
+        pygame.display.flip()
+
+    # the index of the button under the mouse, None if there is none
+    def hovered_button(self):
+        mouse_pos = pygame.mouse.get_pos()
+        for index, button in enumerate(self.buttons):
+            if button.button.collidepoint(mouse_pos):
+                return index
+        return None
+
+    # Each menu has a loop which runs till the user clicks a button.
+    # Nothing on a menu moves, so the loop sleeps until there is input instead of drawing 60 frames a second,
+    # and only the buttons whose hover changed are drawn again and put on the screen.
     def run(self):
-        running = True
-        clicked_button = None
-        while running:
-            for event in pygame.event.get():
+        self.draw()
+        hovered = self.hovered_button()
+
+        while True:
+            events = [pygame.event.wait(MENU_WAKE_UP)] + pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
-
-            self.screen.fill("black")
-
-            self.draw_title_with_shadow()
+                elif event.type == pygame.WINDOWEXPOSED:
+                    # the window was covered or restored, everything has to be drawn again
+                    self.draw()
 
             for index, button in enumerate(self.buttons):
-                button.draw()
                 if button.check_clicked():
-                    clicked_button = index
-                    running = False
-
-            pygame.display.flip()
-            self.clock.tick(FPS)
+                    return index
 
-        return clicked_button
+            now_hovered = self.hovered_button()
+            if now_hovered != hovered:
+                dirty = []
+                for index in (hovered, now_hovered):
+                    if index is not None:
+                        button = self.buttons[index]
+                        self.screen.fill("black", button.area)
+                        button.draw()
+                        dirty.append(button.area)
+                pygame.display.update(dirty)
+                hovered = now_hovered
 
 
 class MainMenu(BaseMenu):
@@ -99,6 +125,20 @@ class AISimulationMenu(BaseMenu):
             "Back"
         ])
 
+INSTRUCTIONS = [
+    "Welcome to Must Go Up!",
+    "In casual play:",
+    "- Use LEFT and RIGHT arrow keys to move.",
+    "- Hold SPACE to charge a jump, release to jump.",
+    "- Combine LEFT/RIGHT with SPACE to jump diagonally.",
+    "- Press Q to return to main menu.",
+    "",
+    "In AI Simulation mode:",
+    "- AI learns to play the game!",
+    "- Press S to switch between real time, fast and turbo.",
+    "- Press Q to end early and see results."
+]
+
 # We override the methods to adjust the button position and write the instructions
 class InstructionsMenu(BaseMenu):
     def __init__(self, screen, font, clock):
@@ -117,53 +157,26 @@ class InstructionsMenu(BaseMenu):
         self.buttons = [
             Button("Back", (btn_x, btn_y), self.screen, self.font, width=button_width, height=button_height)
         ]
+        self.small_font = load_font(self.font.path, SMALL_FONT_SIZE)
 
         self.wait_for_mouse_release()
 
-    def run(self):
-        running = True
-        clicked_button = None
-
-        instructions = [
-            "Welcome to Must Go Up!",
-            "In casual play:",
-            "- Use LEFT and RIGHT arrow keys to move.",
-            "- Hold SPACE to charge a jump, release to jump.",
-            "- Combine LEFT/RIGHT with SPACE to jump diagonally.",
-            "- Press Q to return to main menu.",
-            "",
-            "In AI Simulation mode:",
-            "- AI learns to play the game!",
-            "- Press Q to end early and see results."
-        ]
-
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+    def draw_content(self):
+        # Title plus shadow
+        self.draw_title_with_shadow()
 
-            self.screen.fill("black")
+        # Instructions
+        for i, line in enumerate(INSTRUCTIONS):
+            line_surf = render_text(self.small_font, line, "white")
+            self.screen.blit(line_surf, (60, 100 + i * 28))
 
-            # Title plus shadow
-            self.draw_title_with_shadow()
-
-            # Instructions
-            small_font = pygame.font.Font(self.font.path, 20)
-            for i, line in enumerate(instructions):
-                line_surf = small_font.render(line, True, "white")
-                self.screen.blit(line_surf, (60, 100 + i * 28))
-
-            for index, button in enumerate(self.buttons):
-                button.draw()
-                if button.check_clicked():
-                    clicked_button = index
-                    running = False
-
-            pygame.display.flip()
-            self.clock.tick(FPS)
-
-        return clicked_button
+GRAPH_SIZE = (700, 400)
+# where the graph goes when the summary is short, it moves down and gets shorter for more summary lines
+GRAPH_TOP = 170
+SUMMARY_TOP = 100
+SUMMARY_LINE_HEIGHT = 30
+BEST_COLOR = (0, 128, 0)
+AVERAGE_COLOR = (0, 0, 255)
 
 # This menu contains the graph of the simulation results and the buttons to go back to the main menu or quit
 class SimulationSummaryMenu(BaseMenu):
@@ -188,113 +201,56 @@ class SimulationSummaryMenu(BaseMenu):
             Button("Main Menu", (self.width // 2 - button_width // 2, start_y), self.screen, self.font, width=button_width, height=button_height),
             Button("Quit", (self.width // 2 - button_width // 2, start_y + button_height + spacing), self.screen, self.font, width=button_width, height=button_height)
         ]
+        self.small_font = load_font(self.font.path, SMALL_FONT_SIZE)
+        self.graph_surface = None
+        self.show_message_instead = False
+
+        # the graph sits between the last summary line and the buttons, so it never covers either
+        lines_bottom = SUMMARY_TOP + len(self.summary_lines) * SUMMARY_LINE_HEIGHT
+        graph_top = max(GRAPH_TOP, lines_bottom + 10)
+        graph_height = min(GRAPH_SIZE[1], start_y - 10 - graph_top)
+        self.graph_rect = pygame.Rect(0, graph_top, GRAPH_SIZE[0], graph_height)
+        self.graph_rect.centerx = self.width // 2
 
         self.wait_for_mouse_release()
 
+    # the best and average fitness of every generation, drawn right at the size it is shown at
+    def fitness_chart(self):
+        chart = LineChart(self.graph_rect.width, self.graph_rect.height, self.font.path, title="Fitness Over Generations",
+                          x_label="Generation", y_label="Fitness", integer_x=True)
+        # the first generation is shown as 1 instead of 0
+        return chart.render([
+            ("Best Fitness", self.best_fitness, BEST_COLOR, False),
+            ("Average Fitness", self.average_fitness, AVERAGE_COLOR, True),
+        ], x_start=1)
+
     def run(self):
-        running = True
-        clicked_button = None
-        graph_surface = None
-        show_message_instead = False
+        self.graph_surface = None
+        self.show_message_instead = False
 
         # If we have fitness data, we create the graph
         if self.best_fitness and len(self.best_fitness) >= 2:
-            font_path = self.font.path
-
-            # Custom font needs new font sizes
-            font_title = fm.FontProperties(fname=font_path, size=18)
-            font_labels = fm.FontProperties(fname=font_path, size=16)
-            font_ticks = fm.FontProperties(fname=font_path, size=14)
-            font_legend = fm.FontProperties(fname=font_path, size=14)
-
-            plt.figure(figsize=(10, 5))
-
-            # Setting new colors for axies and labels
-            axi = plt.gca()
-            axi.set_facecolor('white')
-            axi.tick_params(axis='x', colors='black')
-            axi.tick_params(axis='y', colors='black')
-            axi.spines['bottom'].set_color('black')
-            axi.spines['top'].set_color('black')
-            axi.spines['left'].set_color('black')
-            axi.spines['right'].set_color('black')
-
-            # Plot lines
-            # This is to show the first generation as 1 instead of 0
-            generations = list(range(1, len(self.best_fitness) + 1))
-            plt.plot(generations, self.best_fitness, label='Best Fitness', color='green', linewidth=2)
-            plt.plot(generations, self.average_fitness, label='Average Fitness', color='blue', linestyle='--', linewidth=2)
-
-
-            # Labels and title
-            plt.xlabel("Generation", fontproperties=font_labels, color='black')
-            plt.ylabel("Fitness", fontproperties=font_labels, color='black')
-            plt.title("Fitness Over Generations", fontproperties=font_title, color='black')
-
-            # This is so we don't get fractions of generations on the graph which is impossible
-            axi.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
-
-            # applying font to tick labels
-            for label in axi.get_xticklabels() + axi.get_yticklabels():
-                label.set_fontproperties(font_ticks)
-                label.set_color('black')
-
-            # legend with font and color
-            legend = plt.legend(prop=font_legend)
-            for text in legend.get_texts():
-                text.set_color('black')
-            legend.get_frame().set_edgecolor('black')
-            legend.get_frame().set_facecolor('white')
-
-            plt.tight_layout()
-
-            # putting the plot in a pygame surface to display it
-            buf = io.BytesIO()
-            plt.savefig(buf, format='PNG', dpi=300)
-            buf.seek(0)
-            graph_surface = pygame.image.load(buf).convert()
-            graph_surface = pygame.transform.scale(graph_surface, (700, 400))
-            buf.close()
-            plt.close()
+            self.graph_surface = self.fitness_chart()
         else:
             # If we don't have data, we show a message instead of the graph
-            show_message_instead = True
-
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-            self.screen.fill("black")
-
-            # Title
-            self.draw_title_with_shadow()
-
-            # Summary lines, for now it's just the selection method
-            small_font = pygame.font.Font(self.font.path, 20)
-            for i, line in enumerate(self.summary_lines):
-                text_surf = small_font.render(line, True, "white")
-                self.screen.blit(text_surf, (60, 100 + i * 30))
-
-            # Graph or warning message
-            if graph_surface:
-                graph_rect = graph_surface.get_rect(center=(self.width // 2, 370))
-                self.screen.blit(graph_surface, graph_rect)
-            elif show_message_instead:
-                fallback_msg = "Run the simulation for at least a couple generations to see statistics!"
-                msg_surface = small_font.render(fallback_msg, True, "white")
-                msg_rect = msg_surface.get_rect(center=(self.width // 2, 360))
-                self.screen.blit(msg_surface, msg_rect)
-
-            # Buttons
-            for index, button in enumerate(self.buttons):
-                button.draw()
-                if button.check_clicked():
-                    clicked_button = index
-                    running = False
-
-            pygame.display.flip()
-            self.clock.tick(FPS)
-
-        return clicked_button
\ No newline at end of file
+            self.show_message_instead = True
+
+        return super().run()
+
+    def draw_content(self):
+        # Title
+        self.draw_title_with_shadow()
+
+        # Summary lines, for now it's just the selection method
+        for i, line in enumerate(self.summary_lines):
+            text_surf = render_text(self.small_font, line, "white")
+            self.screen.blit(text_surf, (60, SUMMARY_TOP + i * SUMMARY_LINE_HEIGHT))
+
+        # Graph or warning message
+        if self.graph_surface:
+            self.screen.blit(self.graph_surface, self.graph_rect)
+        elif self.show_message_instead:
+            fallback_msg = "Run the simulation for at least a couple generations to see statistics!"
+            msg_surface = render_text(self.small_font, fallback_msg, "white")
+            msg_rect = msg_surface.get_rect(center=(self.width // 2, 360))
+            self.screen.blit(msg_surface, msg_rect)
\ No newline at end of file
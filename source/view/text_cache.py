@@ -0,0 +1,48 @@
+from collections import OrderedDict
+import pygame
+
+# how many rendered strings are kept
+TEXT_CACHE_SIZE = 256
+
+
+# Rendering text is by far the slowest part of drawing a menu, and the menus draw the same few strings every frame.
+# This keeps the rendered surfaces by (font, text, color, antialias) and hands the same surface back, the least
+# recently used one is dropped when it is full. The surfaces are shared, so only blit them, never draw on them.
+class TextCache:
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def render(self, font, text, color, antialias=True):
+        # "white" and (255, 255, 255) are the same color, so the key uses the rgba values
+        key = (font, text, tuple(pygame.Color(color)), antialias)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        if self.max_size > 0:
+            self.entries[key] = surf
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+
+
+# the cache all the views share
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
\ No newline at end of file
@@ -81,6 +81,15 @@ class TestAIPlayer(unittest.TestCase):
         # fitness should be increased since he reached a new platform
         self.assertGreaterEqual(self.ai.fitness, previous_fitness)
 
+    # B0-8
+    def test_seeded_weights(self):
+        first = AIPlayer(torch.Generator().manual_seed(1))
+        second = AIPlayer(torch.Generator().manual_seed(1))
+        first.mutate_weights(0.1, torch.Generator().manual_seed(2))
+        second.mutate_weights(0.1, torch.Generator().manual_seed(2))
+        for k, v in first.brain.state_dict().items():
+            self.assertTrue(torch.equal(v, second.brain.state_dict()[k]))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
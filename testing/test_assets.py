@@ -0,0 +1,50 @@
+import os
+import unittest
+from unittest import mock
+import pygame
+from source import assets
+from source.view.button import Button
+from source.model.platform import Platform
+from source.variables import WIDTH, HEIGHT
+
+pygame.init()
+
+class TestAssets(unittest.TestCase):
+
+    # W19-1
+    def test_buttons_share_one_sound(self):
+        screen = pygame.Surface((WIDTH, HEIGHT))
+        font = pygame.font.Font(None, 24)
+        first = Button("One", (0, 0), screen, font)
+        second = Button("Two", (0, 60), screen, font)
+        self.assertIsNotNone(first.click_sound)
+        self.assertIs(first.click_sound, second.click_sound)
+        self.assertIs(assets.load_sound(assets.CLICK_SOUND_PATH), first.click_sound)
+
+    # B19-2
+    def test_missing_sound_is_none(self):
+        self.assertIsNone(assets.load_sound(os.path.join(assets.ASSETS_DIR, "sounds", "missing.mp3")))
+
+    # W19-3
+    def test_validate(self):
+        assets.validate()
+        with mock.patch.dict(assets.REQUIRED_FILES, {"font": os.path.join(assets.ASSETS_DIR, "missing.ttf")}):
+            with self.assertRaises(FileNotFoundError):
+                assets.validate()
+
+    # B19-4
+    def test_preload_gives_shared_font(self):
+        font = assets.preload()
+        self.assertEqual(font.path, assets.FONT_PATH)
+        self.assertIs(assets.preload(), font)
+
+    # B19-5
+    def test_surfaces_in_display_format(self):
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        platform = Platform(pos=(WIDTH // 2, HEIGHT // 2))
+        self.assertEqual(platform.surf.get_masks(), screen.get_masks())
+        self.assertEqual(platform.surf.get_at((0, 0)), pygame.Color(255, 255, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import unittest
+import json
+import time
+from source.benchmark import measure, run_benchmarks
+
+class TestBenchmark(unittest.TestCase):
+
+    # W16-1
+    def test_measure(self):
+        calls = []
+        runs, seconds = measure(lambda: calls.append(1), min_time=0.0, min_runs=5)
+        self.assertEqual(runs, 5)
+        self.assertEqual(len(calls), 5)
+        self.assertGreater(seconds, 0)
+
+    # B16-2
+    def test_quick_run_covers_every_case(self):
+        report = run_benchmarks(quick=True)
+        names = {row["name"] for row in report["results"]}
+        for name in ("ai_player_move", "population_step", "decide_action", "top_n_selection",
+                     "tournament_selection", "roulette_selection", "generate_platforms", "draw_ai"):
+            self.assertIn(name, names)
+        for row in report["results"]:
+            self.assertGreater(row["value"], 0)
+        # the whole report has to be plain JSON
+        self.assertEqual(json.loads(json.dumps(report)), report)
+
+    # W16-3
+    def test_measure_doesnt_time_setup(self):
+        calls = []
+        runs, seconds = measure(lambda: calls.append("run"), min_time=0.0, min_runs=3,
+                                setup=lambda: (calls.append("setup"), time.sleep(0.05)))
+        self.assertEqual(calls, ["setup", "run"] * 3)
+        self.assertLess(seconds, 0.05)
+
+    # B16-4
+    def test_ticks_are_timed_on_a_live_population(self):
+        report = run_benchmarks(quick=True)
+        for row in report["results"]:
+            if row["name"] in ("ai_player_move", "population_step", "draw_ai"):
+                self.assertEqual(row["alive"], row["size"])
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
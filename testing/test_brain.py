@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+import torch
+import pygame
+from source.model.ai_player import AIPlayer
+from source.model.brain import BatchedBrain
+
+pygame.init()
+
+class TestBatchedBrain(unittest.TestCase):
+
+    def setUp(self):
+        torch.manual_seed(11)
+        self.players = [AIPlayer() for _ in range(12)]
+        self.brain = BatchedBrain.from_players(self.players)
+        self.states = np.random.default_rng(11).uniform(-500, 800, size=(12, 8))
+
+    # W8-1
+    def test_stacked_shapes(self):
+        shapes = [tuple(w.shape) for w in self.brain.weights]
+        self.assertEqual(shapes, [(12, 8, 16), (12, 16, 16), (12, 16, 3)])
+        self.assertEqual(tuple(self.brain.biases[-1].shape), (12, 1, 3))
+
+    # W8-2
+    def test_forward_matches_each_brain(self):
+        idx = np.arange(12)
+        batched = self.brain.forward(idx, self.states)
+        for i, p in enumerate(self.players):
+            with torch.no_grad():
+                single = p.brain(torch.tensor(self.states[i], dtype=torch.float32))
+            self.assertTrue(torch.allclose(batched[i], single, rtol=1e-5, atol=1e-4))
+
+    # W8-3
+    def test_forward_subset(self):
+        # only some bots are grounded, each row must still use its own bot's weights
+        idx = np.array([9, 2, 5])
+        batched = self.brain.forward(idx, self.states[idx])
+        for row, i in enumerate(idx):
+            with torch.no_grad():
+                single = self.players[i].brain(torch.tensor(self.states[i], dtype=torch.float32))
+            self.assertTrue(torch.allclose(batched[row], single, rtol=1e-5, atol=1e-4))
+
+    # B8-4
+    def test_action_ranges(self):
+        actions = self.brain(np.arange(12), self.states)
+        self.assertEqual(actions.shape, (12, 3))
+        self.assertTrue(np.all((-1 <= actions[:, :2]) & (actions[:, :2] <= 1)))
+        self.assertTrue(np.all((0 <= actions[:, 2]) & (actions[:, 2] <= 1)))
+
+    # B8-5
+    def test_no_exploration_matches_act(self):
+        brain = BatchedBrain.from_players(self.players, exploration_scale=0)
+        actions = brain(np.arange(12), self.states)
+        for i, p in enumerate(self.players):
+            with torch.no_grad():
+                output = p.brain(torch.tensor(self.states[i], dtype=torch.float32))
+            expected = [torch.tanh(output[0]).item(), torch.tanh(output[1]).item(), torch.sigmoid(output[2]).item()]
+            np.testing.assert_allclose(actions[i], expected, rtol=1e-5, atol=1e-5)
+
+    # B8-6
+    def test_noise_follows_the_bot(self):
+        # the same bot gets the same exploration whether it decides alone or together with others
+        together = self.brain(np.arange(12), self.states)
+        alone = BatchedBrain.from_players(self.players, noise_keys=self.brain.noise_keys)
+        np.testing.assert_array_equal(alone(np.array([4]), self.states[[4]])[0], together[4])
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
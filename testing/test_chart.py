@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+import pygame
+from source.view.chart import LineChart, LiveChart, decimate, nice_ticks
+
+pygame.init()
+
+class TestChart(unittest.TestCase):
+
+    # W20-1
+    def test_decimate_keeps_extremes(self):
+        values = np.sin(np.arange(10000) / 50.0)
+        values[1234] = 5.0
+        values[8765] = -5.0
+        kept, kept_values = decimate(values, 100)
+        self.assertLessEqual(len(kept), 200)
+        self.assertIn(1234, kept.tolist())
+        self.assertIn(8765, kept.tolist())
+        self.assertTrue(np.all(np.diff(kept) > 0))
+        self.assertTrue(np.array_equal(kept_values, values[kept]))
+
+    # B20-2
+    def test_short_series_untouched(self):
+        kept, kept_values = decimate([3, 1, 2], 100)
+        self.assertEqual(kept.tolist(), [0, 1, 2])
+        self.assertEqual(kept_values.tolist(), [3, 1, 2])
+
+    # W20-3
+    def test_nice_ticks(self):
+        self.assertEqual(nice_ticks(0, 100, 5), [0, 20, 40, 60, 80, 100])
+        self.assertEqual(nice_ticks(1, 3, 8, integer=True), [1, 2, 3])
+        self.assertEqual(nice_ticks(-0.3, 0.3, 6), [-0.3, -0.2, -0.1, 0, 0.1, 0.2, 0.3])
+
+    # B20-4
+    def test_render(self):
+        chart = LineChart(300, 200, None, title="Title", x_label="x", y_label="y")
+        surface = chart.render([("a", [1, 5, 2], (0, 128, 0), False), ("b", [], (0, 0, 255), True)])
+        self.assertEqual(surface.get_size(), (300, 200))
+        self.assertEqual(surface.get_at((1, 1)), pygame.Color(255, 255, 255))
+        # some of the line is drawn
+        pixels = pygame.surfarray.array3d(surface)
+        self.assertTrue(np.any(np.all(pixels == (0, 128, 0), axis=2)))
+
+    # W20-5
+    def test_live_chart_same_as_drawn_again(self):
+        chart = LiveChart()
+        for gen in range(30):
+            chart.add(100 + gen * 3 + (gen % 4) * 10, 50 + gen)
+        incremental = pygame.image.tobytes(chart.surface, "RGB")
+        chart.redraw()
+        self.assertEqual(pygame.image.tobytes(chart.surface, "RGB"), incremental)
+
+    # B20-6
+    def test_live_chart_rarely_redrawn(self):
+        chart = LiveChart()
+        for gen in range(5000):
+            chart.add(gen * 2.0, gen * 1.0)
+        self.assertEqual(len(chart), 5000)
+        self.assertLess(chart.redraws, 40)
+        self.assertGreaterEqual(chart.capacity, 5000)
+        self.assertEqual(chart.surface.get_size(), (chart.width, chart.height))
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import pygame
+from source.control.checkpoint import save_checkpoint, load_checkpoint
+from source.control.controller import Controller
+from source.model.genome import GENOME_SIZE
+
+pygame.init()
+
+# an array that can't be written, to break a save halfway through
+class Unsaveable:
+    def __array__(self, *args, **kwargs):
+        raise RuntimeError("can't save this")
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "run.npz")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    # W14-1
+    def test_save_and_load(self):
+        save_checkpoint(self.path, {"generation": np.array(3), "genomes": np.ones((2, 4), dtype=np.float32)})
+        save_checkpoint(self.path, {"generation": np.array(4), "genomes": np.zeros((2, 4), dtype=np.float32)})
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(int(checkpoint["generation"]), 4)
+        np.testing.assert_array_equal(checkpoint["genomes"], np.zeros((2, 4)))
+        self.assertEqual(os.listdir(self.folder.name), ["run.npz"])
+
+    # W14-2
+    def test_failed_save_keeps_old_checkpoint(self):
+        save_checkpoint(self.path, {"generation": np.array(3)})
+        with self.assertRaises(RuntimeError):
+            save_checkpoint(self.path, {"generation": np.array(4), "genomes": Unsaveable()})
+        self.assertEqual(int(load_checkpoint(self.path)["generation"]), 3)
+        self.assertEqual(os.listdir(self.folder.name), ["run.npz"])
+
+    # B14-3
+    def test_checkpoint_contents(self):
+        controller = Controller(None, None, None, headless=True, seed=6, checkpoint_path=self.path)
+        best, avg = controller.evolve(2, 20, 100, "roulette")
+        checkpoint = load_checkpoint(self.path)
+        self.assertEqual(int(checkpoint["generation"]), 2)
+        self.assertEqual(str(checkpoint["selection_method"]), "roulette")
+        self.assertEqual(checkpoint["genomes"].shape, (20, GENOME_SIZE))
+        self.assertEqual(checkpoint["parent_genomes"].shape, (5, GENOME_SIZE))
+        self.assertEqual(checkpoint["best_fitness"].tolist(), best)
+        self.assertEqual(checkpoint["avg_fitness"].tolist(), avg)
+
+    # B14-4
+    def test_resume_same_as_uninterrupted(self):
+        uninterrupted = Controller(None, None, None, headless=True, seed=12).evolve(4, 20, 150, "tournament")
+
+        stopped = Controller(None, None, None, headless=True, seed=12, checkpoint_path=self.path)
+        stopped.evolve(2, 20, 150, "tournament")
+        # a new controller, like after the process was killed, without the seed it started with
+        resumed = Controller(None, None, None, headless=True, checkpoint_path=self.path)
+        self.assertEqual(resumed.resume(self.path, 4), uninterrupted)
+        self.assertEqual(int(load_checkpoint(self.path)["generation"]), 4)
+
+    # B14-5
+    def test_checkpoint_every_zero_saves_at_the_end(self):
+        controller = Controller(None, None, None, headless=True, seed=3, checkpoint_path=self.path, checkpoint_every=0)
+        controller.evolve(3, 10, 60, "top_n")
+        self.assertEqual(int(load_checkpoint(self.path)["generation"]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
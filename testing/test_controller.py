@@ -1,8 +1,17 @@
+import os
+import sys
+import inspect
+import subprocess
 import unittest
-from source.control.controller import Controller
+from unittest import mock
+from source.control.controller import Controller, SPEED_MODES
+from source.variables import WIDTH, HEIGHT
 from source.model.ai_player import AIPlayer
 import pygame
 
+# seconds the game may take to import before the main menu, without the AI simulation
+IMPORT_BUDGET = 1.0
+
 class TestController(unittest.TestCase):
 
     def setUp(self):
@@ -71,6 +80,83 @@ class TestController(unittest.TestCase):
         for aiplayer in ai:
             self.assertIsInstance(aiplayer, AIPlayer)
 
+    # B2-8
+    def test_run_generation_headless(self):
+        # no screen, font or clock, so this would crash if anything tried to draw or tick the clock
+        controller = Controller(None, None, None, headless=True)
+        results, user_quit, ticks = controller.run_generation(10, 0, 30)
+        self.assertEqual(len(results), 10)
+        self.assertFalse(user_quit)
+        # the budget is in ticks, so a generation can never run longer than that
+        self.assertLessEqual(ticks, 30)
+        for aiplayer, fitness in results:
+            self.assertEqual(aiplayer.fitness, fitness)
+
+    # B2-9
+    def test_seed_repeats_run(self):
+        histories = []
+        for seed in (99, 99, 100):
+            controller = Controller(None, None, None, headless=True, seed=seed)
+            histories.append(controller.evolve(3, 20, 150, "tournament"))
+        # same seed, bit-identical fitness every generation, another seed gives another run
+        self.assertEqual(histories[0], histories[1])
+        self.assertNotEqual(histories[0], histories[2])
+
+    # B2-10
+    def test_speed_doesnt_change_results(self):
+        expected = Controller(None, None, None, headless=True, seed=5).evolve(2, 10, 60, "top_n")
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        font = pygame.font.Font(None, 20)
+        for mode in (1, 2):
+            controller = Controller(screen, font, pygame.time.Clock(), seed=5, render_every=10)
+            controller.speed_mode = mode
+            self.assertEqual(controller.evolve(2, 10, 60, "top_n"), expected)
+
+    # B2-11
+    def test_s_switches_speed(self):
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        controller = Controller(screen, pygame.font.Font(None, 20), pygame.time.Clock(), seed=5)
+        controller.speed_mode = 1
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_s))
+        controller.run_generation(5, 0, 10)
+        self.assertEqual(SPEED_MODES[controller.speed_mode], "turbo")
+
+    # B2-12
+    def test_menus_start_without_torch(self):
+        # a fresh interpreter, the tests have torch imported already
+        code = ("import sys, time\n"
+                "start = time.perf_counter()\n"
+                "import source.control.controller\n"
+                "print(time.perf_counter() - start)\n"
+                "print(' '.join(m for m in ('torch', 'matplotlib') if m in sys.modules))\n")
+        env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True,
+                             cwd=os.path.join(os.path.dirname(__file__), "..")).stdout.splitlines()
+        self.assertEqual(out[1:], [""])
+        self.assertLess(float(out[0]), IMPORT_BUDGET)
+
+    # B2-13
+    def test_menu_round_trips_dont_grow_the_stack(self):
+        # far more trips to the instructions and back than the recursion limit, then quit
+        trips = sys.getrecursionlimit() * 2
+        clicks = iter([2] * trips + [3])
+        depths = []
+
+        def instructions_run():
+            depths.append(len(inspect.stack(0)))
+
+        controller = Controller(None, None, None)
+        with mock.patch("source.control.controller.MainMenu") as main_menu, \
+                mock.patch("source.control.controller.InstructionsMenu") as instructions, \
+                mock.patch("pygame.quit"):
+            main_menu.return_value.run.side_effect = lambda: next(clicks)
+            instructions.return_value.run.side_effect = instructions_run
+            with self.assertRaises(SystemExit):
+                controller.start_game()
+
+        self.assertEqual(len(depths), trips)
+        self.assertEqual(depths[0], depths[-1])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,8 @@
 import unittest
+import random
 import pygame
 from source.view.drawing import Drawing
+from source.view.level import LevelSurface, MAX_CHUNKS
 from source.model.ai_player import AIPlayer
 from source.model.platform import Platform
 from source.variables import WIDTH, HEIGHT
@@ -61,6 +63,40 @@ class TestDrawing(unittest.TestCase):
         except Exception as e:
             self.fail(f"Drawing.drawAI() raised an exception: {e}")
 
+    # W3-4
+    def test_level_matches_drawing_every_platform(self):
+        random.seed(3)
+        platforms = Platform.generate_platforms(60)
+        level = LevelSurface(platforms)
+        expected = pygame.Surface((WIDTH, HEIGHT))
+        for offset in range(-12000, 900, 397):
+            self.screen.fill("black")
+            level.draw(self.screen, offset)
+            expected.fill("black")
+            for plat in platforms:
+                expected.blit(plat.surf, (plat.rect.x, plat.rect.y - offset))
+            self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), pygame.image.tobytes(expected, "RGB"))
+            self.assertLessEqual(len(level.chunks), MAX_CHUNKS)
+
+    # B3-6
+    def test_level_made_once_per_course(self):
+        random.seed(3)
+        platforms = Platform.generate_platforms(10)
+        level = Drawing.level_for(platforms)
+        self.assertIs(Drawing.level_for(platforms), level)
+        self.assertIsNot(Drawing.level_for(Platform.generate_platforms(10)), level)
+        # nothing to draw above the course
+        self.assertIsNone(level.chunk(-100))
+
+    # B3-5
+    def test_player_visible(self):
+        self.bot_low.rect.midbottom = (WIDTH / 2, 300)
+        self.bot_low.rect2.midbottom = (WIDTH / 2, 300)
+        self.assertTrue(Drawing.player_visible(self.bot_low, 0))
+        self.assertTrue(Drawing.player_visible(self.bot_low, 295))
+        self.assertFalse(Drawing.player_visible(self.bot_low, 300))
+        self.assertFalse(Drawing.player_visible(self.bot_low, 300 - HEIGHT - 30))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+import random
+import pygame
+from source.control.controller import Controller
+from source.control.fitness_cache import FitnessCache
+from source.control.checkpoint import cache_path_for
+from source.model.ai_player import AIPlayer
+from source.model.brain import genome_digests, genome_matrix
+from source.model.platform import Platform
+from source.model.population import Population, course_bounds
+from source.control.parallel import simulate
+from source.model.rng import genome_keys
+
+pygame.init()
+
+class TestFitnessCache(unittest.TestCase):
+
+    # W10-1
+    def test_hits_and_misses(self):
+        cache = FitnessCache(10)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1.5)
+        self.assertEqual(cache.get("a"), 1.5)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    # W10-2
+    def test_least_recently_used_dropped(self):
+        cache = FitnessCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        # a is used again, so b is the oldest when c comes in
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    # W10-3
+    def test_same_weights_same_digest(self):
+        a, b, c = AIPlayer(), AIPlayer(), AIPlayer()
+        b.copy_weights_from(a)
+        digests = genome_digests(genome_matrix([a, b, c]))
+        self.assertEqual(digests[0], digests[1])
+        self.assertNotEqual(digests[0], digests[2])
+
+    # B10-4
+    def test_size_zero_is_off(self):
+        cache = FitnessCache(0)
+        cache.put("a", 1)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("a"))
+
+    # B10-5
+    def test_cached_rows_match_simulation(self):
+        # a bot simulated alone gets the same final row as in a bigger batch, which is what the cache relies on
+        random.seed(3)
+        bounds = course_bounds(Platform.generate_platforms(30))
+        genomes = genome_matrix([AIPlayer() for _ in range(12)]).numpy()
+        noise_keys = genome_keys(77, genome_digests(genomes))
+        everyone, _ = simulate(bounds, genomes, noise_keys, 300)
+        alone, _ = simulate(bounds, genomes[[5]], noise_keys[[5]], 300)
+        self.assertEqual(alone.rows([0]), everyone.rows([5]))
+
+        population = Population(2, bounds)
+        population.set_rows([1], everyone.rows([5]))
+        self.assertEqual(population.rows([1]), everyone.rows([5]))
+
+    # B10-6
+    def test_repeated_run_is_cached(self):
+        controller = Controller(None, None, None, headless=True, seed=8)
+        first = controller.evolve(3, 20, 150, "tournament")
+        self.assertEqual(controller.cache_hit_rate, 0.0)
+        # the same seed again on the same controller, every bot comes out of the cache with the same result
+        second = controller.evolve(3, 20, 150, "tournament")
+        self.assertEqual(controller.cache_hit_rate, 1.0)
+        self.assertEqual(first, second)
+
+        uncached = Controller(None, None, None, headless=True, seed=8, cache_size=0)
+        self.assertEqual(uncached.evolve(3, 20, 150, "tournament"), first)
+
+    # W10-7
+    def test_save_and_load(self):
+        cache = FitnessCache(10)
+        cache.put((2 ** 64 - 5, 3, 150, None, 120), (1.5, -2.25, 0, True, 7))
+        cache.put((1, 2, 3, 4, 5), (0.0, 1.0, 2, False, 3))
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "cache.npz")
+            cache.save(path)
+            loaded = FitnessCache(10)
+            loaded.load(path)
+        self.assertEqual(list(loaded.entries.items()), list(cache.entries.items()))
+
+    # B10-8
+    def test_cache_reused_by_another_run(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "cache.npz")
+            first = Controller(None, None, None, headless=True, seed=8, cache_path=path).evolve(3, 20, 150, "top_n")
+            # a new controller, like the same seed run again in a new process
+            again = Controller(None, None, None, headless=True, seed=8, cache_path=path)
+            self.assertEqual(again.evolve(3, 20, 150, "top_n"), first)
+            self.assertEqual(again.cache_hit_rate, 1.0)
+
+    # B10-9
+    def test_resume_reuses_generations_after_the_checkpoint(self):
+        with tempfile.TemporaryDirectory() as folder:
+            checkpoint = os.path.join(folder, "run.npz")
+            cache_path = cache_path_for(checkpoint)
+            # a run saved after generation 2 that got to do generation 3 before it was stopped
+            stopped = Controller(None, None, None, headless=True, seed=4, checkpoint_path=checkpoint,
+                                 cache_path=cache_path)
+            stopped.evolve(2, 20, 150, "tournament")
+            with open(checkpoint, "rb") as f:
+                saved = f.read()
+            stopped.evolve(3, 20, 150, "tournament")
+            with open(checkpoint, "wb") as f:
+                f.write(saved)
+
+            resumed = Controller(None, None, None, headless=True, checkpoint_path=checkpoint, cache_path=cache_path)
+            resumed.resume(checkpoint, 3)
+            self.assertEqual(resumed.cache_hit_rate, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
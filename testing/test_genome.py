@@ -0,0 +1,74 @@
+import unittest
+import torch
+from torch.nn.utils import parameters_to_vector
+from source.model.ai_player import AIPlayer
+from source.model.genome import (GENOME_SIZE, LAYER_SIZES, brain_module, breed, crossover, genome_forward,
+                                 layer_views, random_genomes)
+
+class TestGenome(unittest.TestCase):
+
+    def setUp(self):
+        self.genomes = random_genomes(6, torch.Generator().manual_seed(13))
+
+    # W13-1
+    def test_layout_matches_module(self):
+        self.assertEqual(GENOME_SIZE, 8 * 16 + 16 + 16 * 16 + 16 + 16 * 3 + 3)
+        module = brain_module(self.genomes[2])
+        self.assertTrue(torch.equal(parameters_to_vector(module.parameters()), self.genomes[2]))
+        linears = [layer for layer in module if isinstance(layer, torch.nn.Linear)]
+        self.assertEqual([layer.in_features for layer in linears], list(LAYER_SIZES[:-1]))
+        self.assertEqual([layer.out_features for layer in linears], list(LAYER_SIZES[1:]))
+
+    # W13-2
+    def test_views_write_through(self):
+        weight, bias = layer_views(self.genomes)[1]
+        self.assertEqual(tuple(weight.shape), (6, 16, 16))
+        self.assertEqual(tuple(bias.shape), (6, 16))
+        bias[4].fill_(7.0)
+        self.assertTrue(torch.equal(brain_module(self.genomes[4])[2].bias, torch.full((16,), 7.0)))
+
+    # W13-3
+    def test_breed(self):
+        children = breed(self.genomes, [5, 0, 5], 0.0)
+        self.assertTrue(torch.equal(children, self.genomes[[5, 0, 5]]))
+        # the children are copies, mutating them leaves the parents alone
+        before = self.genomes.clone()
+        mutated = breed(self.genomes, [1, 1], 0.1, torch.Generator().manual_seed(1))
+        self.assertTrue(torch.equal(self.genomes, before))
+        self.assertFalse(torch.equal(mutated[0], mutated[1]))
+
+    # B13-4
+    def test_crossover(self):
+        child = crossover(self.genomes[0], self.genomes[1], torch.Generator().manual_seed(4))
+        from_first = child == self.genomes[0]
+        from_second = child == self.genomes[1]
+        self.assertTrue((from_first | from_second).all())
+        self.assertTrue(from_first.any() and from_second.any())
+
+    # B13-5
+    def test_random_genomes_in_range(self):
+        bound = 1 / 8 ** 0.5
+        first_layer, _ = layer_views(self.genomes)[0]
+        self.assertTrue((first_layer.abs() <= bound).all())
+        same = random_genomes(6, torch.Generator().manual_seed(13))
+        self.assertTrue(torch.equal(same, self.genomes))
+
+    # B13-6
+    def test_players_share_the_matrix(self):
+        players = [AIPlayer(genome=genome) for genome in self.genomes]
+        players[3].mutate_weights(0.5)
+        self.assertTrue(torch.equal(self.genomes[3], players[3].genome))
+        players[0].brain[0].weight.data.fill_(0.25)
+        self.assertTrue(torch.equal(self.genomes[0, :128], torch.full((128,), 0.25)))
+
+    # B13-7
+    def test_forward_without_module(self):
+        states = torch.randn(10, 8, generator=torch.Generator().manual_seed(3)) * 300
+        for genome in self.genomes:
+            module = brain_module(genome)
+            for state in states:
+                self.assertTrue(torch.equal(genome_forward(genome, state), module(state)))
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
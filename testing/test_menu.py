@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 import pygame
 from source.view.menu import BaseMenu, MainMenu, AISimulationMenu, InstructionsMenu, SimulationSummaryMenu
 from source.view.button import Button
@@ -10,6 +11,7 @@ pygame.init()
 class DummyFont(pygame.font.Font):
     def __init__(self):
         super().__init__(None, 24)
+        self.path = None
     
 class DummyMenu(BaseMenu):
     def __init__(self, screen, font, clock, title, button_texts):
@@ -62,7 +64,6 @@ class TestMenus(unittest.TestCase):
 
     # W4-6
     def test_simulation_summary_menu_graph(self):
-        # We simulate enough data for graph generation
         summary = SimulationSummaryMenu(
             self.screen,
             self.font,
@@ -71,29 +72,59 @@ class TestMenus(unittest.TestCase):
             average_fitness=[5, 15, 25],
             summary_lines=["Some summary"]
         )
+        graph_surface = summary.fitness_chart()
+        self.assertIsInstance(graph_surface, pygame.Surface)
+        self.assertEqual(graph_surface.get_size(), (700, 400))
 
-        # Run the graph creation logic manually
-        graph_surface = None
-        try:
-            import matplotlib.pyplot as plt
-            import io
-            import pygame
-
-            # Attempt to render the graph to surface
-            plt.figure(figsize=(5, 3))
-            plt.plot([10, 20, 30], label="Best Fitness")
-            plt.plot([5, 15, 25], label="Average Fitness")
-            plt.legend()
-            buf = io.BytesIO()
-            plt.savefig(buf, format='PNG')
-            buf.seek(0)
-            graph_surface = pygame.image.load(buf).convert()
-            plt.close()
-            buf.close()
-        except Exception as e:
-            self.fail(f"graph generation failed: {e}")
+    # B4-7
+    def test_graph_of_many_generations(self):
+        best = [float(i % 97) for i in range(20000)]
+        summary = SimulationSummaryMenu(self.screen, self.font, self.clock, best_fitness=best,
+                                        average_fitness=[b / 2 for b in best])
+        graph_surface = summary.fitness_chart()
+        self.assertEqual(graph_surface.get_size(), (700, 400))
 
-        self.assertIsInstance(graph_surface, pygame.Surface)
+    # B4-8
+    def test_run_returns_clicked_button(self):
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        menu = MainMenu(screen, self.font, self.clock)
+        target = menu.buttons[2].button.center
+        presses = iter([(0, 0, 0), (1, 0, 0)])
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=target))
+        with mock.patch("pygame.mouse.get_pos", return_value=target), \
+                mock.patch("pygame.mouse.get_pressed", side_effect=lambda *args: next(presses)):
+            self.assertEqual(menu.run(), 2)
+
+    # B4-9
+    def test_hover_only_updates_changed_buttons(self):
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        menu = MainMenu(screen, self.font, self.clock)
+        mouse = [menu.buttons[0].button.center]
+
+        # the mouse moves from the first button to the second while the menu waits
+        def wait(timeout):
+            mouse[0] = menu.buttons[1].button.center
+            return pygame.event.Event(pygame.MOUSEMOTION, pos=mouse[0])
+
+        presses = iter([(0, 0, 0), (1, 0, 0)])
+        updates = []
+        with mock.patch("pygame.mouse.get_pos", side_effect=lambda: mouse[0]), \
+                mock.patch("pygame.event.wait", side_effect=wait), \
+                mock.patch("pygame.mouse.get_pressed", side_effect=lambda *args: next(presses)), \
+                mock.patch("pygame.display.update", side_effect=updates.append):
+            self.assertEqual(menu.run(), 1)
+        self.assertEqual(updates, [[menu.buttons[0].area, menu.buttons[1].area]])
+
+    # B4-10
+    def test_graph_fits_below_summary_lines(self):
+        lines = ["Selection Method: top_n", "Simulated 100 ticks at 100 ticks/s", "Seed: 1",
+                 "Fitness cache hit rate: 0.0%"]
+        summary = SimulationSummaryMenu(self.screen, self.font, self.clock, summary_lines=lines,
+                                        best_fitness=[10, 20, 30], average_fitness=[5, 15, 25])
+        graph_surface = summary.fitness_chart()
+        self.assertEqual(graph_surface.get_size(), summary.graph_rect.size)
+        self.assertGreaterEqual(summary.graph_rect.top, 100 + len(lines) * 30)
+        self.assertLessEqual(summary.graph_rect.bottom, summary.buttons[0].button.top)
 
 
 if __name__ == "__main__":
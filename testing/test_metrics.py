@@ -0,0 +1,101 @@
+import unittest
+import csv
+import json
+import os
+import tempfile
+import pygame
+from source.control.controller import Controller
+from source.control.metrics import FIELDS, MetricsLog, fitness_stats
+
+pygame.init()
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    # W15-1
+    def test_fitness_stats(self):
+        stats = fitness_stats([float(i) for i in range(101)])
+        self.assertEqual(stats["best"], 100.0)
+        self.assertEqual(stats["mean"], 50.0)
+        self.assertEqual(stats["median"], 50.0)
+        self.assertEqual((stats["p10"], stats["p25"], stats["p75"], stats["p90"]), (10.0, 25.0, 75.0, 90.0))
+
+    # W15-2
+    def test_lines_readable_while_open(self):
+        path = os.path.join(self.folder.name, "run.jsonl")
+        log = MetricsLog(path)
+        log.write({"generation": 1, "best": 3.5})
+        # flushed already, someone running tail -f sees it before the log is closed
+        with open(path) as f:
+            self.assertEqual(json.loads(f.readline()), {"generation": 1, "best": 3.5})
+        log.close()
+
+    # B15-3
+    def test_csv_header_once(self):
+        path = os.path.join(self.folder.name, "run.csv")
+        record = {name: 0 for name in FIELDS}
+        log = MetricsLog(path)
+        log.write(record)
+        log.close()
+        log = MetricsLog(path, append=True)
+        log.write(record)
+        log.close()
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], list(FIELDS))
+        self.assertEqual(len(rows), 3)
+
+    # B15-4
+    def test_controller_logs_every_generation(self):
+        path = os.path.join(self.folder.name, "run.jsonl")
+        controller = Controller(None, None, None, headless=True, seed=2, metrics_path=path)
+        best, avg = controller.evolve(3, 20, 100, "top_n")
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["generation"] for r in records], [1, 2, 3])
+        self.assertEqual([r["best"] for r in records], best)
+        for record, mean in zip(records, avg):
+            self.assertAlmostEqual(record["mean"], mean)
+            self.assertEqual(set(record), set(FIELDS))
+            self.assertLessEqual(record["alive"], 20)
+            self.assertLessEqual(record["ticks"], 100)
+
+
+    # B15-5
+    def test_resume_drops_generations_after_the_checkpoint(self):
+        path = os.path.join(self.folder.name, "run.jsonl")
+        checkpoint = os.path.join(self.folder.name, "run.npz")
+        Controller(None, None, None, headless=True, seed=4, checkpoint_path=checkpoint,
+                   metrics_path=path).evolve(2, 20, 100, "top_n")
+        # the run was killed after logging two more generations and half of a third, none of them checkpointed
+        with open(path, "a") as f:
+            f.write(json.dumps({"generation": 3, "best": -1.0}) + "\n")
+            f.write(json.dumps({"generation": 4, "best": -1.0}) + "\n")
+            f.write('{"generation": 5, "be')
+
+        resumed = Controller(None, None, None, headless=True, checkpoint_path=checkpoint, metrics_path=path)
+        best, _ = resumed.resume(checkpoint, 4)
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["generation"] for r in records], [1, 2, 3, 4])
+        self.assertEqual([r["best"] for r in records], best)
+
+    # B15-6
+    def test_drop_after_csv(self):
+        path = os.path.join(self.folder.name, "run.csv")
+        log = MetricsLog(path)
+        for generation in range(1, 6):
+            log.write({name: generation if name == "generation" else 0 for name in FIELDS})
+        log.close()
+        MetricsLog(path, append=True, keep_until=3).close()
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row["generation"] for row in rows], ["1", "2", "3"])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+import unittest
+import random
+import numpy as np
+import pygame
+import torch
+from source.control.controller import Controller
+from source.control.parallel import ParallelEvaluator, simulate
+from source.model.ai_player import AIPlayer
+from source.model.brain import genome_matrix
+from source.model.platform import Platform
+from source.model.population import Population, course_bounds
+from source.model.rng import bot_keys
+
+pygame.init()
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(21)
+        torch.manual_seed(21)
+        self.bounds = course_bounds(Platform.generate_platforms(20))
+        self.genomes = genome_matrix([AIPlayer() for _ in range(40)])
+        self.noise_keys = bot_keys(21, 40)
+
+    # W12-1
+    def test_simulate_runs_to_the_limit_or_the_end(self):
+        population, ticks = simulate(self.bounds, self.genomes, self.noise_keys, 300)
+        self.assertEqual(population.size, 40)
+        self.assertLessEqual(ticks, 300)
+        if ticks < 300:
+            self.assertFalse(population.alive.any())
+
+    # W12-2
+    def test_parallel_matches_sequential(self):
+        sequential, ticks = simulate(self.bounds, self.genomes, self.noise_keys, 600)
+        evaluator = ParallelEvaluator(3)
+        try:
+            parallel, parallel_ticks = evaluator.evaluate(self.bounds, self.genomes.numpy(), self.noise_keys, 600)
+        finally:
+            evaluator.close()
+
+        self.assertEqual(ticks, parallel_ticks)
+        for name in Population.BOT_ARRAYS:
+            np.testing.assert_array_equal(getattr(parallel, name), getattr(sequential, name), err_msg=name)
+
+    # B12-3
+    def test_controller_workers_same_history(self):
+        histories = []
+        for workers in (1, 2):
+            controller = Controller(None, None, None, headless=True, workers=workers, seed=4)
+            histories.append(controller.evolve(2, 20, 200, "top_n"))
+        self.assertEqual(histories[0], histories[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,4 +1,5 @@
 import unittest
+import random
 from source.model.platform import Platform
 from source.variables import WIDTH, HEIGHT
 
@@ -43,5 +44,23 @@ class TestPlatform(unittest.TestCase):
             self.assertGreaterEqual(platform.rect.left, 0)
             self.assertLessEqual(platform.rect.right, WIDTH)
 
+    # B5-6
+    def test_seeded_generation(self):
+        first = Platform.generate_platforms(20, random.Random(3))
+        second = Platform.generate_platforms(20, random.Random(3))
+        self.assertEqual([p.rect for p in first], [p.rect for p in second])
+
+    # B5-7
+    def test_surface_made_when_drawn(self):
+        platform = Platform((WIDTH / 2, HEIGHT / 2), width=80)
+        self.assertIsNone(platform._surf)
+        self.assertEqual(platform.rect.size, (80, 12))
+        self.assertEqual(platform.rect.center, (WIDTH // 2, HEIGHT // 2))
+        platform.set_color((10, 20, 30))
+        self.assertEqual(platform.surf.get_size(), (80, 12))
+        self.assertEqual(platform.surf.get_at((0, 0))[:3], (10, 20, 30))
+        platform.set_color((40, 50, 60))
+        self.assertEqual(platform.surf.get_at((5, 5))[:3], (40, 50, 60))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import unittest
+import random
+import pygame
+import torch
+from source.model.ai_player import AIPlayer
+from source.model.platform import Platform
+from source.model.platform_index import PlatformIndex, closest_above
+from source.variables import WIDTH, vec
+
+pygame.init()
+
+class TestPlatformIndex(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(5)
+        self.index = Platform.generate_platforms(40)
+        self.platforms = list(self.index)
+
+    # W9-1
+    def test_above_matches_scan(self):
+        for y in range(-8000, 900, 37):
+            self.assertIs(self.index.above(y), closest_above(self.platforms, y))
+
+    # W9-2
+    def test_above_at_the_top(self):
+        highest = min(p.rect.top for p in self.platforms)
+        self.assertIsNone(self.index.above(highest))
+
+    # W9-3
+    def test_overlapping_matches_scan(self):
+        for top in range(-8000, 900, 23):
+            bottom = top + 30
+            expected = [p for p in self.platforms if p.rect.top < bottom and p.rect.bottom > top]
+            self.assertEqual(self.index.overlapping(top, bottom), expected)
+
+    # B9-4
+    def test_behaves_like_a_list(self):
+        self.assertIsInstance(self.index, PlatformIndex)
+        self.assertEqual(len(self.index), 41)
+        self.assertIs(self.index[0], self.platforms[0])
+        self.assertIs(self.index[-1], self.platforms[-1])
+        self.assertEqual(list(self.index), self.platforms)
+        self.assertIn(self.platforms[3], self.index)
+
+    # B9-5
+    def test_ai_player_move_same_with_index(self):
+        torch.manual_seed(5)
+        bots = []
+        for _ in range(20):
+            a, b = AIPlayer(), AIPlayer()
+            b.copy_weights_from(a)
+            for p in (a, b):
+                p.pos = vec(WIDTH / 2, self.platforms[0].rect.top)
+                p.rect.midbottom = p.pos
+            bots.append((a, b))
+
+        random.seed(9)
+        for _ in range(600):
+            for a, _ in bots:
+                if a.alive:
+                    a.move(self.platforms)
+        random.seed(9)
+        for _ in range(600):
+            for _, b in bots:
+                if b.alive:
+                    b.move(self.index)
+
+        for a, b in bots:
+            self.assertEqual((a.pos.x, a.pos.y, a.fitness, a.alive), (b.pos.x, b.pos.y, b.fitness, b.alive))
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -88,6 +88,17 @@ class TestPlayer(unittest.TestCase):
         self.player.start_charge(self.platforms)
         self.assertFalse(self.player.charging)
 
+    # B6-9
+    def test_surfaces_made_when_drawn(self):
+        # nothing is allocated for a player that is only simulated
+        self.assertIsNone(self.player._surf1)
+        self.assertIsNone(self.player._surf2)
+        self.assertEqual(self.player.surf1.get_size(), self.player.rect.size)
+        self.assertEqual(self.player.surf2.get_at((0, 0))[:3], (255, 0, 255))
+        self.player.set_colors((1, 2, 3), (4, 5, 6))
+        self.assertEqual(self.player.surf1.get_at((0, 0))[:3], (1, 2, 3))
+        self.assertEqual(self.player.surf2.get_at((0, 0))[:3], (4, 5, 6))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
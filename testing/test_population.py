@@ -0,0 +1,179 @@
+import unittest
+import random
+import numpy as np
+import pygame
+import torch
+from source.model.ai_player import AIPlayer
+from source.model.platform import Platform
+from source.model.population import Population, course_bounds, player_policy, pygame_round
+from source.variables import WIDTH, TICK_LIMIT, vec
+
+pygame.init()
+
+class TestPopulation(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        torch.manual_seed(7)
+        self.platforms = Platform.generate_platforms(10)
+        self.bounds = course_bounds(self.platforms)
+
+    # places bots like setupAI does, the second list gets the exact same brains
+    def make_players(self, count):
+        first, second = [], []
+        for _ in range(count):
+            a, b = AIPlayer(), AIPlayer()
+            b.copy_weights_from(a)
+            for p in (a, b):
+                p.pos = vec(WIDTH / 2, self.platforms[0].rect.top)
+                p.rect.midbottom = p.pos
+                p.rect2.centerx = p.pos.x
+                p.rect2.centery = p.rect.centery
+            first.append(a)
+            second.append(b)
+        return first, second
+
+    # W7-1
+    def test_pygame_round(self):
+        values = [10.4, 10.5, 10.6, -0.5, -1.5, -2.7, 0.0, 12.49999]
+        rect = pygame.Rect(0, 0, 2, 2)
+        for value, rounded in zip(values, pygame_round(np.array(values))):
+            rect.x = value
+            self.assertEqual(rect.x, rounded)
+
+    # W7-2
+    def test_course_bounds(self):
+        self.assertEqual(self.bounds.shape, (len(self.platforms), 5))
+        for row, plat in zip(self.bounds, self.platforms):
+            self.assertEqual(tuple(row), (plat.rect.left, plat.rect.top, plat.rect.right, plat.rect.bottom, plat.num))
+
+    # W7-3
+    def test_matches_ai_player_move(self):
+        # one seed can easily miss a jump strength where numpy and python round differently, so a few of them
+        # and a whole generation each
+        for seed in range(8):
+            with self.subTest(seed=seed):
+                random.seed(seed)
+                torch.manual_seed(seed)
+                self.platforms = Platform.generate_platforms(10)
+                self.bounds = course_bounds(self.platforms)
+                reference, players = self.make_players(30)
+
+                # reference run, exactly what run_generation used to do
+                random.seed(seed)
+                alive = list(reference)
+                for _ in range(TICK_LIMIT):
+                    for ap in alive:
+                        ap.move(self.platforms)
+                    alive = [p for p in alive if p.alive]
+
+                # same brains and the same random numbers, but moved as a population
+                random.seed(seed)
+                population = Population.from_players(players, self.bounds)
+                policy = player_policy(players)
+                for _ in range(TICK_LIMIT):
+                    population.step(policy)
+
+                # some bots must have actually done something or this test proves nothing
+                self.assertTrue(any(p.highestReached > 0 or not p.alive for p in reference))
+                for i, ref in enumerate(reference):
+                    self.assertEqual(population.pos_x[i], ref.pos.x)
+                    self.assertEqual(population.pos_y[i], ref.pos.y)
+                    self.assertEqual(population.vel_x[i], ref.vel.x)
+                    self.assertEqual(population.vel_y[i], ref.vel.y)
+                    self.assertEqual(population.alive[i], ref.alive)
+                    self.assertEqual(population.control[i], ref.control)
+                    self.assertEqual(population.fitness[i], ref.fitness)
+                    self.assertEqual(population.highest_fitness[i], ref.highestFitness)
+                    self.assertEqual(population.highest_reached[i], ref.highestReached)
+
+    # B7-4
+    def test_gravity_and_max_fall_speed(self):
+        population = Population(3, self.bounds)
+        population.pos_y[:] = -5000
+        population.control[:] = False
+        for _ in range(100):
+            population.step(lambda idx, states: np.zeros((len(idx), 3)))
+        # far above every platform, the bots just fall at max fall speed
+        self.assertTrue(np.all(population.vel_y == 10))
+
+    # B7-5
+    def test_leaving_screen_kills(self):
+        population = Population(2, self.bounds)
+        population.pos_x[:] = [WIDTH - 1, WIDTH / 2]
+        population.vel_x[:] = [5, 0]
+        population.control[:] = False
+        population.step(lambda idx, states: np.zeros((len(idx), 3)))
+        self.assertFalse(population.alive[0])
+        self.assertTrue(population.alive[1])
+
+        # dead bots are not moved anymore
+        before = population.pos_x[0]
+        population.step(lambda idx, states: np.zeros((len(idx), 3)))
+        self.assertEqual(population.pos_x[0], before)
+
+    # B7-6
+    def test_jump_on_first_platform(self):
+        population = Population(1, self.bounds)
+        # full strength jump straight up, the first jump is rewarded
+        population.step(lambda idx, states: np.array([[0.0, 0.0, 1.0]]))
+        self.assertFalse(population.control[0])
+        self.assertLess(population.vel_y[0], 0)
+        self.assertEqual(population.fitness[0], 25)
+
+    # B7-7
+    def test_sync_players(self):
+        _, players = self.make_players(5)
+        population = Population.from_players(players, self.bounds)
+        population.pos_x[:] = 100.0
+        population.fitness[:] = 42
+        population.next_plat[:] = 1
+        population.sync_players(players, self.platforms)
+        for p in players:
+            self.assertEqual(p.pos.x, 100.0)
+            self.assertEqual(p.rect.centerx, 100)
+            self.assertEqual(p.fitness, 42)
+            self.assertIs(p.nextPlat, self.platforms[1])
+
+    # W7-8
+    def test_still_bots_retired(self):
+        # a policy that never walks or jumps, every bot just stands on the first platform
+        population = Population(5, self.bounds, still_limit=10)
+        policy = lambda idx, states: np.zeros((len(idx), 3))
+        for _ in range(9):
+            population.step(policy)
+        self.assertFalse(population.retired.any())
+        population.step(policy)
+        self.assertTrue(population.retired.all())
+        self.assertTrue(population.alive.all())
+        self.assertFalse(population.running())
+
+        # retired bots aren't moved anymore
+        before = population.rows(np.arange(5))
+        population.step(lambda idx, states: np.ones((len(idx), 3)))
+        self.assertEqual(population.rows(np.arange(5)), before)
+
+    # B7-9
+    def test_bouncing_bots_retired(self):
+        # jumping straight up forever moves the bots but never reaches a new platform
+        population = Population(3, self.bounds, progress_limit=50)
+        policy = lambda idx, states: np.tile([0.0, 0.0, 0.6], (len(idx), 1))
+        for _ in range(49):
+            population.step(policy)
+        self.assertFalse(population.retired.any())
+        self.assertLess(population.still_ticks.max(), 49)
+        population.step(policy)
+        self.assertTrue(population.retired.all())
+
+    # B7-10
+    def test_no_limits_never_retires(self):
+        population = Population(5, self.bounds)
+        policy = lambda idx, states: np.zeros((len(idx), 3))
+        for _ in range(300):
+            population.step(policy)
+        self.assertFalse(population.retired.any())
+        self.assertTrue(population.running())
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import unittest
+import os
+import json
+import tempfile
+import pygame
+from source.control.controller import Controller
+from source.profiler import NO_PHASE, Profiler, format_totals, profiler
+
+pygame.init()
+
+class TestProfiler(unittest.TestCase):
+
+    # W17-1
+    def test_off_records_nothing(self):
+        timer = Profiler()
+        self.assertIs(timer.phase("physics"), NO_PHASE)
+        with timer.phase("physics"):
+            pass
+        self.assertEqual(timer.take_totals(), {})
+
+    # W17-2
+    def test_totals_per_generation(self):
+        timer = Profiler()
+        timer.reset(enabled=True)
+        for _ in range(3):
+            with timer.phase("physics"):
+                with timer.phase("collision"):
+                    pass
+        totals = timer.take_totals()
+        self.assertEqual(totals["physics"][1], 3)
+        self.assertEqual(totals["collision"][1], 3)
+        # nested phases are counted in the one around them too
+        self.assertGreaterEqual(totals["physics"][0], totals["collision"][0])
+        self.assertEqual(timer.take_totals(), {})
+        self.assertEqual(timer.events, [])
+        self.assertIn("physics=", format_totals(totals))
+
+    # B17-3
+    def test_trace_export(self):
+        timer = Profiler()
+        timer.reset(trace=True)
+        with timer.phase("brain"):
+            pass
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "trace.json")
+            timer.write_trace(path)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["name"], "brain")
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertGreaterEqual(events[0]["dur"], 0)
+
+    # B17-4
+    def test_controller_profiles_generations(self):
+        controller = Controller(None, None, None, headless=True, seed=1, profile=True)
+        controller.evolve(2, 20, 100, "top_n")
+        self.assertEqual(len(controller.phase_totals), 2)
+        for totals in controller.phase_totals:
+            for phase in ("generation", "setup", "evaluate", "get_state", "brain", "physics", "collision"):
+                self.assertIn(phase, totals)
+        # the shared profiler is off again after the run
+        self.assertFalse(profiler.enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
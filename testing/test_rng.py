@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+import torch
+from source.model.rng import RandomStreams, bot_keys, keyed_uniform, mix64
+
+class TestRng(unittest.TestCase):
+
+    # W11-1
+    def test_keyed_uniform_range(self):
+        values = keyed_uniform(bot_keys(1, 1000), np.zeros(1000, dtype=np.uint64), 3)
+        self.assertEqual(values.shape, (1000, 3))
+        self.assertTrue(np.all((values >= 0) & (values < 1)))
+        # not a proof of randomness, but a badly broken mix would be far off
+        self.assertAlmostEqual(values.mean(), 0.5, delta=0.05)
+
+    # W11-2
+    def test_keyed_uniform_depends_only_on_key_and_counter(self):
+        keys = bot_keys(3, 10)
+        counters = np.arange(10, dtype=np.uint64)
+        everyone = keyed_uniform(keys, counters, 3)
+        some = keyed_uniform(keys[[7, 2]], counters[[7, 2]], 3)
+        np.testing.assert_array_equal(some, everyone[[7, 2]])
+
+    # B11-3
+    def test_different_seeds_and_counters(self):
+        self.assertFalse(np.array_equal(bot_keys(1, 5), bot_keys(2, 5)))
+        keys = bot_keys(1, 5)
+        first = keyed_uniform(keys, np.zeros(5, dtype=np.uint64), 3)
+        second = keyed_uniform(keys, np.ones(5, dtype=np.uint64), 3)
+        self.assertFalse(np.array_equal(first, second))
+        self.assertEqual(mix64(np.uint64(42)), mix64(np.uint64(42)))
+
+    # B11-4
+    def test_streams_state_round_trip(self):
+        streams = RandomStreams(17)
+        streams.course.getrandbits(64)
+        streams.selection.gauss(0, 1)
+        torch.rand(10, generator=streams.mutation)
+        copy = RandomStreams.from_state(streams.get_state())
+        self.assertEqual(copy.seed, 17)
+        self.assertEqual(copy.course.getrandbits(64), streams.course.getrandbits(64))
+        self.assertEqual(copy.selection.gauss(0, 1), streams.selection.gauss(0, 1))
+        self.assertEqual(copy.breeding.random(), streams.breeding.random())
+        self.assertTrue(torch.equal(torch.rand(5, generator=copy.mutation), torch.rand(5, generator=streams.mutation)))
+
+    # B11-5
+    def test_negative_seed(self):
+        streams = RandomStreams(-1)
+        self.assertEqual(streams.seed, -1)
+        self.assertEqual(streams.course.getrandbits(64), RandomStreams(2 ** 64 - 1).course.getrandbits(64))
+        self.assertEqual(RandomStreams.from_state(streams.get_state()).seed, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
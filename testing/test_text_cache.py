@@ -0,0 +1,52 @@
+import os
+import unittest
+import pygame
+from source.view.font import load_font, GameFont
+from source.view.text_cache import TextCache
+
+pygame.init()
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "assets", "font", "Pixellari.ttf")
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        self.font = load_font(FONT_PATH, 20)
+
+    # W18-1
+    def test_same_text_rendered_once(self):
+        cache = TextCache(10)
+        first = cache.render(self.font, "Must Go Up!", "white")
+        self.assertIs(cache.render(self.font, "Must Go Up!", (255, 255, 255)), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIsNot(cache.render(self.font, "Must Go Up!", "gray"), first)
+
+    # W18-2
+    def test_looks_like_font_render(self):
+        cache = TextCache(10)
+        surf = cache.render(self.font, "Gen Num 3", (255, 255, 255))
+        expected = self.font.render("Gen Num 3", True, (255, 255, 255))
+        self.assertEqual(surf.get_size(), expected.get_size())
+        self.assertEqual(pygame.image.tobytes(surf, "RGBA"), pygame.image.tobytes(expected, "RGBA"))
+
+    # B18-3
+    def test_least_recently_used_dropped(self):
+        cache = TextCache(2)
+        a = cache.render(self.font, "a", "white")
+        cache.render(self.font, "b", "white")
+        cache.render(self.font, "a", "white")
+        cache.render(self.font, "c", "white")
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render(self.font, "a", "white"), a)
+        self.assertEqual(cache.misses, 3)
+
+    # B18-4
+    def test_fonts_loaded_once(self):
+        self.assertIs(load_font(FONT_PATH, 20), self.font)
+        self.assertIsNot(load_font(FONT_PATH, 27), self.font)
+        self.assertIsInstance(self.font, GameFont)
+        self.assertEqual(self.font.path, FONT_PATH)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file